@@ -706,7 +706,7 @@ from dotenv import load_dotenv
 import os
 import logging
 from datetime import datetime
-from backend.qa_chain import get_answer
+from backend.qa_chain import get_answer_stream, pipeline_stats, retrieve
 
 # Load environment variables
 load_dotenv()
@@ -835,19 +835,110 @@ def try_read_file_content(file_path):
         logger.error(f"Binary read error: {e}")
         return None
 
+def render_sources(source_docs, key_prefix="download"):
+    """Render the Sources & References section for a list of source documents"""
+    if not source_docs:
+        return
+    st.markdown(f"### 📚 Sources & References ({min(5, len(source_docs))} of {len(source_docs)})")
+    for i, doc in enumerate(source_docs[:5]):
+        source_info = format_source_display(doc, i)
+        with st.expander(f"📋 Source {i + 1}: {source_info['type']} - {source_info['name']}", expanded=True):
+            st.markdown(f"""<div class="source-card"><p><strong>Content Preview:</strong></p><p style="font-style: italic; color: #a0a0a0;">{source_info['content_preview']}</p></div>""", unsafe_allow_html=True)
+            col1, col2 = st.columns([1, 1])
+            with col1:
+                found_file_path = find_document_file(source_info['full_source'])
+
+                if not found_file_path and not source_info['full_source'].startswith('http'):
+                    original_path = source_info['full_source']
+                    normalized_path = original_path.replace('\\', '/')
+                    filename = os.path.basename(normalized_path)
+                    alternative_paths = [
+                        original_path,
+                        normalized_path,
+                        filename,
+                        os.path.join("source_documents", filename),
+                        os.path.join(".", "source_documents", filename),
+                        os.path.join(os.getcwd(), "source_documents", filename),
+                    ]
+                    for alt_path in alternative_paths:
+                        if os.path.exists(alt_path) and os.path.isfile(alt_path):
+                            found_file_path = alt_path
+                            break
+
+                if found_file_path:
+                    file_content = try_read_file_content(found_file_path)
+                    if file_content:
+                        file_data = file_content.encode('utf-8') if isinstance(file_content, str) else file_content
+                        st.download_button(
+                            label=f"📥 Download Document",
+                            data=file_data,
+                            file_name=os.path.basename(found_file_path),
+                            key=f"{key_prefix}_{i}",
+                            help=f"Download: {source_info['name']}"
+                        )
+                else:
+                    if source_info['full_source'].startswith('http'):
+                        st.info("🌐 Web source - see link below")
+                    else:
+                        st.warning("📍 File not accessible for download")
+                        with st.expander("🔧 Debug Info", expanded=False):
+                            normalized_path = source_info['full_source'].replace('\\', '/')
+                            filename = os.path.basename(source_info['full_source'])
+                            st.write("**Original path:**", source_info['full_source'])
+                            st.write("**Normalized path:**", normalized_path)
+                            st.write("**Filename:**", filename)
+                            st.write("**Current directory:**", os.getcwd())
+
+            with col2:
+                if source_info['full_source'].startswith('http'):
+                    st.markdown(f"[🔗 View Online Source]({source_info['full_source']})")
+                else:
+                    st.code(f"Source: {source_info['full_source']}")
+
+def render_answer(placeholder, answer_text, cursor=False):
+    html = answer_text.replace(chr(10), '<br>') + (" ▌" if cursor else "")
+    placeholder.markdown(f"""<div class="answer-container">{html}</div>""", unsafe_allow_html=True)
+
 def process_question(question):
-    """Process the selected question and get answer"""
+    """Stream the answer for a question into the page as it is generated"""
     st.session_state.latest_query = question
     st.session_state.query_count += 1
-    with st.spinner("🔍 Searching knowledge base..."):
-        try:
-            response = get_answer(question)
-            st.session_state.latest_response = response
-        except Exception as e:
-            st.session_state.latest_response = {
-                "answer": f"Error occurred: {str(e)}",
-                "source_documents": []
-            }
+
+    st.markdown("---")
+    st.markdown(f"""<div class="query-display"><strong>🔍 Your Question:</strong> {question}</div>""", unsafe_allow_html=True)
+    st.markdown("### 📋 Answer")
+    status_placeholder = st.empty()
+    answer_placeholder = st.empty()
+    status_placeholder.info("🔍 Searching knowledge base...")
+
+    answer_text = ""
+    response = None
+    try:
+        # Sources are ready in milliseconds; show them while the answer is written
+        retrieved = retrieve(question)
+        render_sources(retrieved["source_documents"], key_prefix="preview")
+        for event in get_answer_stream(question, retrieval=retrieved["retrieval"]):
+            if event["type"] == "sources":
+                status_placeholder.info(f"✍️ Writing answer from {len(event['source_documents'])} sources ({event['tier']})...")
+            elif event["type"] == "token":
+                answer_text += event["content"]
+                render_answer(answer_placeholder, answer_text, cursor=True)
+            elif event["type"] == "retract":
+                # The model gave up part-way; the next attempt starts from scratch
+                answer_text = ""
+                answer_placeholder.empty()
+                status_placeholder.info("🔄 Trying a broader search...")
+            elif event["type"] == "final":
+                response = event["response"]
+        st.session_state.latest_response = response or {
+            "answer": answer_text or "No answer generated.",
+            "source_documents": []
+        }
+    except Exception as e:
+        st.session_state.latest_response = {
+            "answer": f"Error occurred: {str(e)}",
+            "source_documents": []
+        }
 
 # --- Enhanced Sidebar ---
 with st.sidebar:
@@ -926,6 +1017,11 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
 
+    # Admin view of the process-wide cache, coalescing, gate, prefetch and routing counters
+    if os.getenv("SHOW_PIPELINE_STATS", "false").lower() == "true":
+        with st.expander("📊 Pipeline Stats", expanded=False):
+            st.json(pipeline_stats())
+
 
 # --- Main Page ---
 st.markdown('<h1 class="main-title">🤖 MeitY Knowledge Base AI Agent</h1>', unsafe_allow_html=True)
@@ -938,6 +1034,8 @@ if "latest_query" not in st.session_state:
     st.session_state.latest_query = ""
 if "latest_response" not in st.session_state:
     st.session_state.latest_response = None
+if "pending_query" not in st.session_state:
+    st.session_state.pending_query = None
 
 # Example questions
 example_questions = [
@@ -962,8 +1060,7 @@ for i, question in enumerate(example_questions):
             help=f"Click to ask: {question}",
             use_container_width=True
         ):
-            process_question(question)
-            st.rerun()
+            st.session_state.pending_query = question
 
 st.markdown("---")
 
@@ -979,7 +1076,15 @@ with col2:
     submitted = st.button("🔍 Get Answer", type="primary", use_container_width=True)
 
 if submitted and query_text:
-    process_question(query_text)
+    st.session_state.pending_query = query_text
+
+# --- Streamed Response ---
+# Answered here, below the inputs, so tokens render where the answer will be shown;
+# the rerun then draws the full response with sources and refreshes the sidebar count
+if st.session_state.pending_query:
+    process_question(st.session_state.pending_query)
+    st.session_state.pending_query = None
+    st.rerun()
 
 # --- Display Response ---
 if st.session_state.latest_response:
@@ -990,63 +1095,7 @@ if st.session_state.latest_response:
     st.markdown("### 📋 Answer")
     st.markdown(f"""<div class="answer-container">{answer_text.replace(chr(10), '<br>')}</div>""", unsafe_allow_html=True)
 
-    source_docs = st.session_state.latest_response.get("source_documents", [])
-    if source_docs:
-        st.markdown(f"### 📚 Sources & References ({min(5, len(source_docs))} of {len(source_docs)})")
-        for i, doc in enumerate(source_docs[:5]):
-            source_info = format_source_display(doc, i)
-            with st.expander(f"📋 Source {i + 1}: {source_info['type']} - {source_info['name']}", expanded=True):
-                st.markdown(f"""<div class="source-card"><p><strong>Content Preview:</strong></p><p style="font-style: italic; color: #a0a0a0;">{source_info['content_preview']}</p></div>""", unsafe_allow_html=True)
-                col1, col2 = st.columns([1, 1])
-                with col1:
-                    found_file_path = find_document_file(source_info['full_source'])
-
-                    if not found_file_path and not source_info['full_source'].startswith('http'):
-                        original_path = source_info['full_source']
-                        normalized_path = original_path.replace('\\', '/')
-                        filename = os.path.basename(normalized_path)
-                        alternative_paths = [
-                            original_path,
-                            normalized_path,
-                            filename,
-                            os.path.join("source_documents", filename),
-                            os.path.join(".", "source_documents", filename),
-                            os.path.join(os.getcwd(), "source_documents", filename),
-                        ]
-                        for alt_path in alternative_paths:
-                            if os.path.exists(alt_path) and os.path.isfile(alt_path):
-                                found_file_path = alt_path
-                                break
-
-                    if found_file_path:
-                        file_content = try_read_file_content(found_file_path)
-                        if file_content:
-                            file_data = file_content.encode('utf-8') if isinstance(file_content, str) else file_content
-                            st.download_button(
-                                label=f"📥 Download Document",
-                                data=file_data,
-                                file_name=os.path.basename(found_file_path),
-                                key=f"download_{i}",
-                                help=f"Download: {source_info['name']}"
-                            )
-                    else:
-                        if source_info['full_source'].startswith('http'):
-                            st.info("🌐 Web source - see link below")
-                        else:
-                            st.warning("📍 File not accessible for download")
-                            with st.expander("🔧 Debug Info", expanded=False):
-                                normalized_path = source_info['full_source'].replace('\\', '/')
-                                filename = os.path.basename(source_info['full_source'])
-                                st.write("**Original path:**", source_info['full_source'])
-                                st.write("**Normalized path:**", normalized_path)
-                                st.write("**Filename:**", filename)
-                                st.write("**Current directory:**", os.getcwd())
-
-                with col2:
-                    if source_info['full_source'].startswith('http'):
-                        st.markdown(f"[🔗 View Online Source]({source_info['full_source']})")
-                    else:
-                        st.code(f"Source: {source_info['full_source']}")
+    render_sources(st.session_state.latest_response.get("source_documents", []))
 
 # --- Footer ---
 st.markdown("---")
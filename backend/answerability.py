@@ -0,0 +1,135 @@
+import re
+import math
+import logging
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple, Any
+
+from langchain.docstore.document import Document
+
+try:
+    from sentence_transformers import CrossEncoder
+except ImportError:
+    CrossEncoder = None
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class GateConfig:
+    MIN_TERM_COVERAGE = 0.2  # Share of the query's content terms that must appear in the context
+    CONFIDENT_MARGIN = 0.1  # Top score this far above the attempt's threshold passes regardless of coverage
+    PREFIX_LENGTH = 5  # Terms sharing this prefix count as a match ("amendments" ~ "amended")
+    CROSS_ENCODER_MIN_PROBABILITY = 0.05  # Best (query, chunk) relevance below this skips the attempt
+    CROSS_ENCODER_MAX_CHARS = 2000  # Chunk text scored by the cross-encoder
+
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "could", "did", "do", "does", "for", "from",
+    "has", "have", "how", "i", "in", "is", "it", "its", "me", "of", "on", "or", "should", "tell", "that",
+    "the", "their", "there", "these", "this", "those", "to", "was", "were", "what", "when", "where",
+    "which", "who", "whom", "why", "will", "with", "would", "you", "your", "about", "explain", "describe",
+    "give", "list", "please", "main", "role", "any", "all", "some", "into", "under", "between"
+}
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def content_terms(text: str) -> List[str]:
+    """Lowercased word tokens of text minus stopwords and one-letter tokens."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def term_coverage(query: str, docs: List[Document]) -> float:
+    """Share of the query's distinct content terms found (exactly or by prefix) in the documents."""
+    terms = set(content_terms(query))
+    if not terms:
+        return 1.0
+    tokens = set()
+    for doc in docs:
+        tokens.update(_TOKEN_RE.findall(doc.page_content.lower()))
+    prefixes = {t[:GateConfig.PREFIX_LENGTH] for t in tokens if len(t) >= GateConfig.PREFIX_LENGTH}
+    found = sum(1 for t in terms if t in tokens or (len(t) >= GateConfig.PREFIX_LENGTH and t[:GateConfig.PREFIX_LENGTH] in prefixes))
+    return found / len(terms)
+
+
+class AnswerabilityGate:
+    """
+    Cheap pre-LLM check of whether a cascade attempt's context can answer the query.
+
+    By default the decision uses the score distribution and query-term
+    coverage: an attempt is skipped when its best score is within
+    GateConfig.CONFIDENT_MARGIN of the attempt's threshold and fewer than
+    GateConfig.MIN_TERM_COVERAGE of the query's content terms occur in its
+    chunks. If `cross_encoder_model` is set (and sentence-transformers is
+    installed) a local cross-encoder scores each (query, chunk) pair instead,
+    and the attempt is skipped when no chunk reaches
+    GateConfig.CROSS_ENCODER_MIN_PROBABILITY. Every skip is one LLM call
+    avoided; stats() reports the counts.
+    """
+
+    def __init__(self, enabled: bool = True, cross_encoder_model: Optional[str] = None):
+        self.enabled = enabled
+        self.cross_encoder_model = cross_encoder_model
+        self._cross_encoder = None
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.skipped = 0
+        self.skipped_by_attempt: Counter = Counter()
+
+    def _get_cross_encoder(self):
+        if not self.cross_encoder_model:
+            return None
+        if CrossEncoder is None:
+            logger.warning("sentence-transformers is not installed, answerability gate falls back to heuristics")
+            self.cross_encoder_model = None
+            return None
+        with self._lock:
+            if self._cross_encoder is None:
+                logger.info(f"Loading answerability cross-encoder {self.cross_encoder_model}...")
+                self._cross_encoder = CrossEncoder(self.cross_encoder_model)
+        return self._cross_encoder
+
+    def signals(self, query: str, docs: List[Document], scores: List[float], threshold: float) -> Dict[str, Any]:
+        """Inputs to the decision: top score margin over the threshold, term coverage and cross-encoder probability."""
+        top_score = max(scores) if scores else 0.0
+        signals = {
+            "top_score": top_score,
+            "margin": top_score - threshold,
+            "coverage": term_coverage(query, docs),
+            "cross_encoder": None
+        }
+        cross_encoder = self._get_cross_encoder()
+        if cross_encoder is not None and docs:
+            try:
+                logits = cross_encoder.predict([(query, doc.page_content[:GateConfig.CROSS_ENCODER_MAX_CHARS]) for doc in docs])
+                signals["cross_encoder"] = max(1 / (1 + math.exp(-float(logit))) for logit in logits)
+            except Exception as e:
+                logger.error(f"Cross-encoder scoring failed, using heuristics: {e}")
+        return signals
+
+    def assess(self, query: str, docs: List[Document], scores: List[float], threshold: float, attempt_type: str = "") -> Tuple[bool, Dict[str, Any]]:
+        """Returns (answerable, signals) and counts the skip if not answerable."""
+        if not self.enabled:
+            return True, {}
+
+        signals = self.signals(query, docs, scores, threshold)
+        if signals["cross_encoder"] is not None:
+            answerable = signals["cross_encoder"] >= GateConfig.CROSS_ENCODER_MIN_PROBABILITY
+        else:
+            answerable = signals["margin"] >= GateConfig.CONFIDENT_MARGIN or signals["coverage"] >= GateConfig.MIN_TERM_COVERAGE
+
+        with self._lock:
+            self.checked += 1
+            if not answerable:
+                self.skipped += 1
+                self.skipped_by_attempt[attempt_type] += 1
+        return answerable, signals
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "checked": self.checked,
+            "llm_calls_avoided": self.skipped,
+            "skip_rate": self.skipped / self.checked if self.checked else 0.0,
+            "avoided_by_attempt": dict(self.skipped_by_attempt)
+        }
@@ -0,0 +1,274 @@
+import os
+import json
+import time
+import atexit
+import pickle
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Any
+
+import numpy as np
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def save_pickle_atomic(obj: Any, path: str) -> None:
+    """Pickles obj to path via a temp file so readers never see a partial write."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_pickle(path: str) -> Optional[Any]:
+    """Loads a pickle written by save_pickle_atomic, or None if missing/corrupt."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        logger.error(f"Could not load cache file {path}: {e}")
+        return None
+
+
+def normalize_query(query: str) -> str:
+    """Lowercases and collapses whitespace so trivially different queries share a key."""
+    return " ".join(query.lower().split()).rstrip("?.! ")
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable SHA-256 of JSON-serializable parts, for use as a cache key."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class PersistentLRUCache:
+    """
+    Base of the process caches: entries in least-recently-used order, at
+    most `max_entries` of them, each expiring `ttl_seconds` after it was
+    stored (never if None). With `persist_path` the entries are reloaded,
+    minus expired ones, on start, and changes are pickled there by a
+    background timer at most every `persist_interval` seconds (and at
+    exit), so no request waits on the write.
+
+    Entries are dicts carrying a "created_at" timestamp; get() and put()
+    wrap plain values, subclasses may store richer entries via
+    _get_entry() / _put_entry().
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None, persist_path: Optional[str] = None,
+                 persist_interval: float = 5.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist_path = persist_path
+        self.persist_interval = persist_interval
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._dirty = False
+        self._persist_timer: Optional[threading.Timer] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+        if persist_path:
+            atexit.register(self.flush)
+
+    # --- persistence ---
+    def _state(self) -> Any:
+        """What gets pickled; subclasses with more state extend it."""
+        return list(self._entries.items())
+
+    def _restore(self, state: Any) -> None:
+        self._entries = OrderedDict(state)
+
+    def _load(self) -> None:
+        state = load_pickle(self.persist_path)
+        if not state:
+            return
+        self._restore(state)
+        self._expire()
+        logger.info(f"Loaded {len(self._entries)} {type(self).__name__} entries from {self.persist_path}")
+
+    def _save(self) -> None:
+        """Marks the cache changed and schedules a background write (callers hold self._lock)."""
+        if not self.persist_path:
+            return
+        self._dirty = True
+        if self._persist_timer is None:
+            self._persist_timer = threading.Timer(self.persist_interval, self.flush)
+            self._persist_timer.daemon = True
+            self._persist_timer.start()
+
+    def flush(self) -> None:
+        """Writes pending changes to persist_path now."""
+        with self._lock:
+            self._persist_timer = None
+            if not self._dirty or not self.persist_path:
+                return
+            self._dirty = False
+            state = self._state()  # Snapshot; entries are not modified once stored
+        try:
+            save_pickle_atomic(state, self.persist_path)
+        except Exception as e:
+            logger.error(f"Could not persist {type(self).__name__} to {self.persist_path}: {e}")
+
+    # --- entries (callers hold self._lock) ---
+    def _is_expired(self, entry: Dict, now: float) -> bool:
+        return self.ttl_seconds is not None and entry["created_at"] < now - self.ttl_seconds
+
+    def _expire(self) -> None:
+        now = time.time()
+        for key in [key for key, entry in self._entries.items() if self._is_expired(entry, now)]:
+            del self._entries[key]
+
+    def _get_entry(self, key: str) -> Optional[Dict]:
+        """The live entry for key (now most recently used), counting the hit or miss."""
+        entry = self._entries.get(key)
+        if entry is not None and self._is_expired(entry, time.time()):
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def _put_entry(self, key: str, entry: Dict) -> None:
+        entry.setdefault("created_at", time.time())
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._expire()
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        self._save()
+
+    # --- public API ---
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the value stored under key if it has not expired, else None."""
+        with self._lock:
+            entry = self._get_entry(key)
+            return entry["value"] if entry is not None else None
+
+    def put(self, key: str, value: Any) -> None:
+        """Stores value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._put_entry(key, {"value": value})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._save()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+class SemanticAnswerCache(PersistentLRUCache):
+    """
+    Cache of get_answer results looked up by query-embedding similarity.
+
+    A query hits when the cosine similarity between its (L2-normalized)
+    embedding and a stored query's embedding reaches `threshold`. The whole
+    cache is dropped whenever the index version changes (i.e. a FAISS index
+    was rebuilt).
+    """
+
+    def __init__(self, threshold: float = 0.95, ttl_seconds: float = 24 * 3600,
+                 max_entries: int = 500, persist_path: Optional[str] = None):
+        self.threshold = threshold
+        self._index_version: Optional[str] = None
+        super().__init__(max_entries, ttl_seconds, persist_path)
+
+    def _state(self) -> Any:
+        return {"index_version": self._index_version, "entries": list(self._entries.items())}
+
+    def _restore(self, state: Any) -> None:
+        self._index_version = state.get("index_version")
+        self._entries = OrderedDict(state.get("entries", []))
+
+    def _check_version(self, index_version: str) -> None:
+        if index_version == self._index_version:
+            return
+        self._index_version = index_version
+        if self._entries:
+            logger.info(f"🗑️ Index version changed, dropping {len(self._entries)} cached answers")
+            self._entries.clear()
+            self._save()
+
+    def lookup(self, query_embedding: np.ndarray, index_version: str) -> Optional[Dict]:
+        """Returns a copy of the cached answer for the most similar earlier query, if similar enough."""
+        with self._lock:
+            self._check_version(index_version)
+            self._expire()
+            if not self._entries:
+                self.misses += 1
+                return None
+
+            keys = list(self._entries)
+            matrix = np.stack([self._entries[key]["embedding"] for key in keys])
+            similarities = matrix @ np.asarray(query_embedding, dtype=np.float32)
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                self.misses += 1
+                return None
+            entry = self._get_entry(keys[best])
+
+        answer = dict(entry["answer"])
+        answer["source_documents"] = list(answer.get("source_documents", []))
+        answer["similarity_scores"] = list(answer.get("similarity_scores", []))
+        answer["cache"] = {"hit": True, "similarity": float(similarities[best]), "cached_query": entry["query"]}
+        return answer
+
+    def store(self, query: str, query_embedding: np.ndarray, answer: Dict, index_version: str) -> None:
+        """Stores an answer under the query's embedding, evicting the least recently used entry if full."""
+        with self._lock:
+            self._check_version(index_version)
+            self._put_entry(normalize_query(query), {
+                "query": query,
+                "embedding": np.asarray(query_embedding, dtype=np.float32),
+                "answer": {k: v for k, v in answer.items() if k != "cache"}
+            })
+
+
+class LLMResponseCache(PersistentLRUCache):
+    """
+    Exact-match cache of LLM completions.
+
+    Keys are fingerprints of everything that determines the prompt and the
+    model's settings, so a hit means an identical request was already
+    answered. Values are dicts. A refusal (aborted generation) is stored as
+    {"answer": None} so it is not paid for again right away, but only for
+    `negative_ttl_seconds`: at temperature > 0 a retry may well answer.
+    """
+
+    def __init__(self, max_entries: int = 1000, persist_path: Optional[str] = None,
+                 negative_ttl_seconds: float = 3600):
+        self.negative_ttl_seconds = negative_ttl_seconds
+        super().__init__(max_entries, persist_path=persist_path)
+
+    def _is_expired(self, entry: Dict, now: float) -> bool:
+        if entry["value"].get("answer") is None:
+            return entry["created_at"] < now - self.negative_ttl_seconds
+        return super()._is_expired(entry, now)
+
+
+class TTLCache(PersistentLRUCache):
+    """Key-value cache whose entries expire `ttl_seconds` after they are stored."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 500, persist_path: Optional[str] = None):
+        super().__init__(max_entries, ttl_seconds, persist_path)
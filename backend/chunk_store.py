@@ -0,0 +1,114 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from typing import Dict, Optional, Union
+from langchain_community.docstore.base import Docstore
+from langchain.docstore.document import Document
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Written next to index.faiss / index.pkl in every index directory
+CHUNK_STORE_FILE = "chunks.sqlite"
+
+
+def write_chunk_store(index_path: str, vectordb, compression: Optional[str] = None) -> str:
+    """
+    Writes every chunk of a FAISS vector store to an SQLite chunk store.
+
+    Rows are keyed by FAISS id and hold the docstore id, the chunk text and
+    its metadata as JSON. With compression="zstd" the text is compressed
+    (requires the zstandard package). The file is built under a temporary
+    name and swapped in atomically.
+
+    Returns:
+        Path of the written chunk store
+    """
+    if compression == "zstd" and zstd is None:
+        logger.warning("zstandard is not installed, writing chunk store uncompressed (pip install zstandard)")
+        compression = None
+
+    store_path = os.path.join(index_path, CHUNK_STORE_FILE)
+    tmp_path = store_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    compressor = zstd.ZstdCompressor(level=3) if compression == "zstd" else None
+
+    def rows():
+        for faiss_id, doc_id in vectordb.index_to_docstore_id.items():
+            doc = vectordb.docstore.search(doc_id)
+            if not isinstance(doc, Document):
+                logger.warning(f"Docstore has no chunk for FAISS id {faiss_id}, skipping")
+                continue
+            text = doc.page_content.encode("utf-8")
+            if compressor:
+                text = compressor.compress(text)
+            yield int(faiss_id), str(doc_id), text, json.dumps(doc.metadata, default=str)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("CREATE TABLE chunks (faiss_id INTEGER PRIMARY KEY, doc_id TEXT NOT NULL UNIQUE, text BLOB NOT NULL, metadata TEXT NOT NULL)")
+        conn.execute("INSERT INTO meta VALUES ('compression', ?)", (compression or "none",))
+        conn.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?)", rows())
+        conn.commit()
+        count = conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, store_path)
+    logger.info(f"Wrote {count} chunks to {store_path} (compression: {compression or 'none'})")
+    return store_path
+
+
+class ChunkStoreDocstore(Docstore):
+    """
+    Read-only LangChain docstore backed by a chunk store written by write_chunk_store.
+
+    Nothing but the FAISS id -> docstore id map is read up front; search()
+    fetches a single row, so a query only reads the top-k chunks it returns.
+    Each thread gets its own read-only SQLite connection.
+    """
+
+    def __init__(self, store_path: str):
+        self.store_path = store_path
+        self._local = threading.local()
+        row = self._connection().execute("SELECT value FROM meta WHERE key = 'compression'").fetchone()
+        self.compression = row[0] if row else "none"
+        if self.compression == "zstd" and zstd is None:
+            raise ImportError(f"{store_path} is zstd-compressed but the zstandard package is not installed")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.store_path}?mode=ro", uri=True, check_same_thread=False)
+            self._local.conn = conn
+            self._local.decompressor = zstd.ZstdDecompressor() if self.compression == "zstd" else None
+        return conn
+
+    def _decode(self, text: bytes) -> str:
+        if self.compression == "zstd":
+            text = self._local.decompressor.decompress(text)
+        return text.decode("utf-8") if isinstance(text, bytes) else text
+
+    def search(self, search: str) -> Union[str, Document]:
+        """Fetches one chunk by docstore id."""
+        row = self._connection().execute("SELECT text, metadata FROM chunks WHERE doc_id = ?", (search,)).fetchone()
+        if row is None:
+            return f"ID {search} not found."
+        return Document(page_content=self._decode(row[0]), metadata=json.loads(row[1]))
+
+    def index_to_docstore_id(self) -> Dict[int, str]:
+        """FAISS id -> docstore id map, as FAISS.index_to_docstore_id expects."""
+        return {faiss_id: doc_id for faiss_id, doc_id in self._connection().execute("SELECT faiss_id, doc_id FROM chunks")}
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
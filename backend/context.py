@@ -0,0 +1,196 @@
+import re
+import math
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain.docstore.document import Document
+
+from backend.tokens import count_tokens_batch
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def chunk_token_counts(docs: List[Document]) -> List[int]:
+    """Token counts stored at ingest ("token_count" metadata); chunks without one are counted now."""
+    missing = [i for i, doc in enumerate(docs) if not doc.metadata.get("token_count")]
+    counts = [doc.metadata.get("token_count") or 0 for doc in docs]
+    if missing:
+        for i, count in zip(missing, count_tokens_batch([docs[i].page_content for i in missing])):
+            counts[i] = count
+    return counts
+
+
+def merge_overlapping_chunks(docs: List[Document], scores: List[Optional[float]]) -> Tuple[List[Document], List[Optional[float]], List[int]]:
+    """
+    Merges chunks of the same source and page whose character ranges overlap
+    or touch, as neighbouring chunks do with the splitter's chunk_overlap.
+
+    Needs the "start_index" metadata written at ingest; other chunks are
+    kept as they are. A merged chunk takes the best score and the rank of
+    its best member, so the result is still ordered by score.
+
+    Returns:
+        (docs, scores, token counts)
+    """
+    token_counts = chunk_token_counts(docs)
+    entries = [
+        {"doc": doc, "score": score, "rank": rank, "tokens": tokens, "text": doc.page_content, "parts": 1}
+        for rank, (doc, score, tokens) in enumerate(zip(docs, scores, token_counts))
+    ]
+
+    groups: Dict[Tuple, List[Dict]] = {}
+    merged = []
+    for entry in entries:
+        metadata = entry["doc"].metadata
+        if metadata.get("start_index") is None:
+            merged.append(entry)
+        else:
+            groups.setdefault((metadata.get("source"), metadata.get("page")), []).append(entry)
+
+    for group in groups.values():
+        group.sort(key=lambda e: e["doc"].metadata["start_index"])
+        current = dict(group[0], start=group[0]["doc"].metadata["start_index"])
+        for entry in group[1:]:
+            start = entry["doc"].metadata["start_index"]
+            current_end = current["start"] + len(current["text"])
+            if start > current_end:
+                merged.append(current)
+                current = dict(entry, start=start)
+                continue
+            added = entry["text"][current_end - start:]
+            if added:
+                current["text"] += added
+                current["tokens"] += math.ceil(entry["tokens"] * len(added) / max(len(entry["text"]), 1))
+            current["parts"] += entry["parts"]
+            current["rank"] = min(current["rank"], entry["rank"])
+            if entry["score"] is not None and (current["score"] is None or entry["score"] > current["score"]):
+                current["score"] = entry["score"]
+        merged.append(current)
+
+    merged.sort(key=lambda e: e["rank"])
+    result_docs = []
+    for entry in merged:
+        if entry["parts"] == 1:
+            result_docs.append(entry["doc"])
+        else:
+            metadata = dict(entry["doc"].metadata, token_count=entry["tokens"], merged_chunks=entry["parts"])
+            result_docs.append(Document(page_content=entry["text"], metadata=metadata))
+    return result_docs, [entry["score"] for entry in merged], [entry["tokens"] for entry in merged]
+
+
+def pack_context(docs: List[Document], scores: List[Optional[float]], token_budget: int) -> Tuple[List[Document], List[Optional[float]]]:
+    """
+    Merges overlapping chunks, then greedily keeps the highest-scoring
+    chunks that fit in `token_budget` prompt tokens. A chunk that does not
+    fit is skipped and smaller, lower-scoring ones are still tried; the best
+    chunk is always kept.
+    """
+    if not docs:
+        return docs, scores
+    merged_docs, merged_scores, token_counts = merge_overlapping_chunks(docs, scores)
+
+    ranked = sorted(range(len(merged_docs)), key=lambda i: merged_scores[i] if merged_scores[i] is not None else 0.0, reverse=True)
+    packed = []
+    used = 0
+    for i in ranked:
+        if packed and used + token_counts[i] > token_budget:
+            continue
+        packed.append(i)
+        used += token_counts[i]
+
+    logger.info(f"Packed {len(packed)} of {len(merged_docs)} context chunks ({len(docs)} before merging) "
+                f"into {used} tokens (budget {token_budget})")
+    return [merged_docs[i] for i in packed], [merged_scores[i] for i in packed]
+
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Splits text at sentence-ending punctuation and line breaks."""
+    return [sentence.strip() for sentence in _SENTENCE_RE.split(text) if sentence and sentence.strip()]
+
+
+def sentence_embeddings(docs: List[Document], doc_sentences: List[List[str]], embed_texts: Callable[[List[str]], np.ndarray],
+                        cache: Optional[Any] = None, chunk_key: Optional[Callable[[Document], str]] = None) -> List[Optional[np.ndarray]]:
+    """
+    Embedding matrix of each chunk's sentences (None for chunks without any).
+    Chunks found in `cache` under chunk_key(doc) are not embedded again; the
+    others are embedded in one batch and stored there.
+    """
+    matrices: List[Optional[np.ndarray]] = [None] * len(docs)
+    missing = []
+    for i, (doc, sentences) in enumerate(zip(docs, doc_sentences)):
+        if not sentences:
+            continue
+        if cache is not None:
+            matrices[i] = cache.get(chunk_key(doc))
+        if matrices[i] is None:
+            missing.append(i)
+
+    if missing:
+        batch = embed_texts([sentence for i in missing for sentence in doc_sentences[i]])
+        start = 0
+        for i in missing:
+            end = start + len(doc_sentences[i])
+            matrices[i] = np.array(batch[start:end])
+            start = end
+            if cache is not None:
+                cache.put(chunk_key(docs[i]), matrices[i])
+        logger.debug(f"Embedded sentences of {len(missing)} chunks, {len(docs) - len(missing)} from cache")
+    return matrices
+
+
+def compress_context(docs: List[Document], scores: List[Optional[float]], query_embedding: np.ndarray,
+                     embed_texts: Callable[[List[str]], np.ndarray], token_budget: int,
+                     cache: Optional[Any] = None, chunk_key: Optional[Callable[[Document], str]] = None) -> Tuple[List[Document], List[Optional[float]]]:
+    """
+    Extractive compression: keeps only the sentences most similar to the query.
+
+    The sentences of every chunk are embedded (in one batch, skipping chunks
+    already in `cache`, see sentence_embeddings) and scored against the
+    query embedding with a single matrix-vector product. The best sentences
+    are kept until `token_budget` is reached (the single best sentence
+    always is), each chunk is rebuilt from its kept sentences in their
+    original order, and chunks left empty are dropped. `embed_texts` must
+    return L2-normalized rows.
+    """
+    token_counts = chunk_token_counts(docs)
+    doc_sentences = [split_sentences(doc.page_content) for doc in docs]
+    sentences = []  # (doc index, sentence index, text, estimated tokens)
+    for i, (chunk_sentences, tokens) in enumerate(zip(doc_sentences, token_counts)):
+        chars = max(sum(len(s) for s in chunk_sentences), 1)
+        for j, sentence in enumerate(chunk_sentences):
+            sentences.append((i, j, sentence, math.ceil(tokens * len(sentence) / chars)))
+    if not sentences:
+        return docs, scores
+
+    matrix = np.vstack([m for m in sentence_embeddings(docs, doc_sentences, embed_texts, cache, chunk_key) if m is not None])
+    similarities = matrix @ np.asarray(query_embedding, dtype=np.float32)
+
+    kept = set()
+    used = 0
+    for k in np.argsort(-similarities, kind="stable"):
+        tokens = sentences[k][3]
+        if kept and used + tokens > token_budget:
+            continue
+        kept.add(int(k))
+        used += tokens
+
+    compressed_docs, compressed_scores = [], []
+    for i, (doc, score) in enumerate(zip(docs, scores)):
+        parts = [(j, sentence, tokens) for k, (d, j, sentence, tokens) in enumerate(sentences) if d == i and k in kept]
+        if not parts:
+            continue
+        text = parts[0][1]
+        for (prev_j, _, _), (j, sentence, _) in zip(parts, parts[1:]):
+            text += (" " if j == prev_j + 1 else " ... ") + sentence
+        metadata = dict(doc.metadata, token_count=sum(tokens for _, _, tokens in parts), original_token_count=token_counts[i])
+        compressed_docs.append(Document(page_content=text, metadata=metadata))
+        compressed_scores.append(score)
+
+    logger.info(f"Compressed context from {sum(token_counts)} to ~{used} tokens "
+                f"({len(kept)} of {len(sentences)} sentences, {len(compressed_docs)} of {len(docs)} chunks)")
+    return compressed_docs, compressed_scores
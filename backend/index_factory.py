@@ -0,0 +1,173 @@
+import os
+import json
+import math
+import logging
+from typing import Dict, Tuple, Optional
+
+import numpy as np
+import faiss
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Saved next to index.faiss; holds the index type and its search-time parameters
+INDEX_PARAMS_FILE = "index_params.json"
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+# Names the live version directory of an index that is rewritten while in use (see index_dir)
+CURRENT_VERSION_FILE = "CURRENT"
+
+
+class IndexConfig:
+    TRAIN_SAMPLE_SIZE = 50000  # Vectors sampled to train IVF centroids / PQ codebooks
+    MIN_POINTS_PER_CENTROID = 39  # FAISS warns when training with fewer
+    MIN_VECTORS_FOR_IVF = 1000  # Below this an exact flat index is just as fast
+    IVF_NPROBE = 16  # Inverted lists visited per query
+    HNSW_M = 32  # Graph neighbours per node
+    HNSW_EF_CONSTRUCTION = 200
+    HNSW_EF_SEARCH = 64  # Candidate list size per query
+    PQ_M = 64  # Sub-quantizers; 1024-dim BGE vectors -> 16 dims each
+    PQ_NBITS = 8
+
+
+def index_type_of(index: faiss.Index) -> str:
+    """Maps a FAISS index object to one of INDEX_TYPES."""
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(index, faiss.IndexIVF):
+        return "ivf_flat"
+    return "flat"
+
+
+def ivf_nlist(num_vectors: int) -> int:
+    """Number of IVF lists: about 4*sqrt(n), capped so every centroid gets enough training points."""
+    return max(1, min(int(4 * math.sqrt(num_vectors)), num_vectors // IndexConfig.MIN_POINTS_PER_CENTROID))
+
+
+def index_vectors(index: faiss.Index) -> np.ndarray:
+    """Returns every stored vector of an index (approximate for PQ indexes)."""
+    if isinstance(index, faiss.IndexIVF):
+        index.make_direct_map()
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def create_index(vectors: np.ndarray, index_type: str = "flat", seed: int = 0) -> Tuple[faiss.Index, Dict]:
+    """
+    Builds an L2 index of the given type over `vectors`.
+
+    IVF types are trained on a random sample of at most
+    IndexConfig.TRAIN_SAMPLE_SIZE vectors. Corpora too small to train on fall
+    back to a flat index with a warning.
+
+    Returns:
+        (index, params) where params is what save_index_params writes
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    num_vectors, dim = vectors.shape
+
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{index_type}', expected one of {INDEX_TYPES}")
+
+    pq_min = IndexConfig.MIN_POINTS_PER_CENTROID * (1 << IndexConfig.PQ_NBITS)
+    if index_type in ("ivf_flat", "ivf_pq") and num_vectors < IndexConfig.MIN_VECTORS_FOR_IVF:
+        logger.warning(f"Only {num_vectors} vectors - too few to train {index_type}, using flat index")
+        index_type = "flat"
+    elif index_type == "ivf_pq" and num_vectors < pq_min:
+        logger.warning(f"Only {num_vectors} vectors - PQ needs {pq_min} to train, using ivf_flat index")
+        index_type = "ivf_flat"
+
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(dim)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, IndexConfig.HNSW_M)
+        index.hnsw.efConstruction = IndexConfig.HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = IndexConfig.HNSW_EF_SEARCH
+    else:
+        nlist = ivf_nlist(num_vectors)
+        quantizer = faiss.IndexFlatL2(dim)
+        if index_type == "ivf_flat":
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist)
+        else:
+            pq_m = max(m for m in range(1, IndexConfig.PQ_M + 1) if dim % m == 0)
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, pq_m, IndexConfig.PQ_NBITS)
+
+        rng = np.random.default_rng(seed)
+        sample_size = min(num_vectors, IndexConfig.TRAIN_SAMPLE_SIZE)
+        sample = vectors[rng.choice(num_vectors, sample_size, replace=False)]
+        logger.info(f"Training {index_type} index (nlist={nlist}) on {sample_size} of {num_vectors} vectors...")
+        index.train(sample)
+        index.nprobe = min(IndexConfig.IVF_NPROBE, nlist)
+
+    index.add(vectors)
+    return index, search_params_of(index)
+
+
+def search_params_of(index: faiss.Index) -> Dict:
+    """Index type plus the search-time parameters that must travel with it."""
+    index_type = index_type_of(index)
+    params = {"index_type": index_type}
+    if index_type == "hnsw":
+        params["efSearch"] = index.hnsw.efSearch
+    elif index_type in ("ivf_flat", "ivf_pq"):
+        params["nprobe"] = index.nprobe
+        params["nlist"] = index.nlist
+    return params
+
+
+def index_dir(index_path: str) -> str:
+    """
+    Directory holding an index's live files. Indexes updated at runtime are
+    saved to a new version directory under index_path each time and the
+    version named in its CURRENT file is the live one; for every other
+    index this is index_path itself.
+    """
+    try:
+        with open(os.path.join(index_path, CURRENT_VERSION_FILE), "r", encoding="utf-8") as f:
+            version = f.read().strip()
+    except OSError:
+        return index_path
+    return os.path.join(index_path, version) if version else index_path
+
+
+def save_index_params(index_path: str, index: faiss.Index) -> Dict:
+    params = search_params_of(index)
+    with open(os.path.join(index_path, INDEX_PARAMS_FILE), "w", encoding="utf-8") as f:
+        json.dump(params, f)
+    return params
+
+
+def load_index_params(index_path: str) -> Dict:
+    params_file = os.path.join(index_path, INDEX_PARAMS_FILE)
+    if not os.path.exists(params_file):
+        return {}
+    try:
+        with open(params_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Could not read {params_file}: {e}")
+        return {}
+
+
+def apply_search_params(index: faiss.Index, params: Dict, nprobe: Optional[int] = None, ef_search: Optional[int] = None) -> None:
+    """Sets nprobe / efSearch on a loaded index; explicit arguments override the saved values."""
+    index_type = index_type_of(index)
+    if index_type == "hnsw":
+        value = ef_search or params.get("efSearch")
+        if value:
+            index.hnsw.efSearch = int(value)
+    elif index_type in ("ivf_flat", "ivf_pq"):
+        value = nprobe or params.get("nprobe")
+        if value:
+            index.nprobe = int(value)
+
+
+def search_parameters(index: faiss.Index, selector: Optional[faiss.IDSelector] = None) -> faiss.SearchParameters:
+    """Per-call search parameters carrying the index's own nprobe/efSearch, so a selector does not reset them."""
+    index_type = index_type_of(index)
+    kwargs = {"sel": selector} if selector is not None else {}
+    if index_type == "hnsw":
+        return faiss.SearchParametersHNSW(efSearch=index.hnsw.efSearch, **kwargs)
+    if index_type in ("ivf_flat", "ivf_pq"):
+        return faiss.SearchParametersIVF(nprobe=index.nprobe, **kwargs)
+    return faiss.SearchParameters(**kwargs)
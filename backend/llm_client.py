@@ -0,0 +1,543 @@
+import time
+import queue
+import random
+import asyncio
+import logging
+import threading
+import weakref
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+import httpx
+from langchain_together import ChatTogether
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server errors
+TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+TRANSIENT_ERROR_NAMES = {
+    "APIConnectionError", "APITimeoutError", "ConnectError", "ConnectTimeout",
+    "ReadTimeout", "ReadError", "RemoteProtocolError", "PoolTimeout"
+}
+
+
+def is_transient(error: BaseException) -> bool:
+    """True for failures a retry may fix (connection errors, timeouts, 429 and 5xx responses)."""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status in TRANSIENT_STATUS_CODES
+    return type(error).__name__ in TRANSIENT_ERROR_NAMES or isinstance(error, (TimeoutError, ConnectionError))
+
+
+class TokenBucket:
+    """Rate limiter: `rate` requests per second on average, bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns how many seconds the caller must wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RetryBudget:
+    """
+    Process-wide cap on retries. Every request deposits `ratio` of a retry
+    and `min_per_second` more accrue over time so low traffic can still
+    retry; the balance never exceeds `max_balance`. When providers fail
+    broadly, retries stop at about `ratio` of traffic instead of multiplying it.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 0.5, max_balance: float = 10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_balance = max_balance
+        self._balance = max_balance
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, amount: float) -> None:
+        now = time.monotonic()
+        self._balance = min(self.max_balance, self._balance + amount + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def on_request(self) -> None:
+        with self._lock:
+            self._refill(self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            self._refill(0.0)
+            if self._balance >= 1:
+                self._balance -= 1
+                return True
+            return False
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class InFlightLimit:
+    """
+    Process-wide cap of `limit` concurrent requests, shared by threads
+    (`with limit:`) and coroutines on any event loop (`async with limit:`).
+    Slots are handed out first come, first served; a released slot goes
+    straight to the oldest waiter, which is woken on its own thread or loop.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._used = 0
+        self._waiters: deque = deque()  # threading.Event or (loop, future)
+        self._lock = threading.Lock()
+
+    def _take(self, waiter: Any) -> bool:
+        """Takes a free slot, or queues `waiter` and returns False."""
+        with self._lock:
+            if self._used < self.limit and not self._waiters:
+                self._used += 1
+                return True
+            self._waiters.append(waiter)
+            return False
+
+    def acquire(self) -> None:
+        event = threading.Event()
+        if not self._take(event):
+            event.wait()
+
+    async def aacquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        if self._take(waiter):
+            return
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                queued = waiter in self._waiters
+                if queued:
+                    self._waiters.remove(waiter)
+            if not queued:
+                self.release()  # The slot was handed over as the wait was cancelled
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._waiters:
+                self._used -= 1
+                return
+            waiter = self._waiters.popleft()  # The slot passes to it, _used stays the same
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+            return
+        loop, future = waiter
+        try:
+            loop.call_soon_threadsafe(_wake, future)
+        except RuntimeError:
+            self.release()  # Its loop is closed; offer the slot to the next waiter
+
+    @property
+    def in_use(self) -> int:
+        return self._used
+
+    def __enter__(self) -> "InFlightLimit":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    async def __aenter__(self) -> "InFlightLimit":
+        await self.aacquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+
+class LatencyHistogram:
+    """Rolling window of the `window` most recent latencies, in seconds."""
+
+    def __init__(self, window: int = 200):
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """The given percentile (0-100) of the window, or None while it is empty."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(round(percentile / 100 * (len(samples) - 1))))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class HedgingPolicy:
+    """
+    Decides when to send a second, identical LLM request. A request is
+    hedged when it has produced nothing after the `percentile` of recent
+    first-chunk latencies (once `min_samples` are known), as long as hedges
+    stay within `max_hedge_rate` of the last `window` requests. A hedge
+    counts as soon as it is granted, so many requests turning slow at once
+    cannot all hedge before the first of them finishes.
+    """
+
+    def __init__(self, percentile: float = 95.0, max_hedge_rate: float = 0.1, min_samples: int = 20,
+                 window: int = 200, min_delay: float = 0.05):
+        self.percentile = percentile
+        self.max_hedge_rate = max_hedge_rate
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.latencies = LatencyHistogram(window)
+        self._hedged: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "hedged": 0, "hedge_wins": 0, "hedges_denied": 0}
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait for the first request before hedging, or None to never hedge it."""
+        if len(self.latencies) < self.min_samples:
+            return None
+        return max(self.min_delay, self.latencies.percentile(self.percentile))
+
+    def try_hedge(self) -> bool:
+        """Grants a hedge, and counts it, if it keeps the window's hedges within max_hedge_rate."""
+        with self._lock:
+            if sum(self._hedged) + 1 > self.max_hedge_rate * max(len(self._hedged), 1):
+                self._counters["hedges_denied"] += 1
+                return False
+            self._hedged.append(True)
+            self._counters["hedged"] += 1
+            return True
+
+    def record(self, latency: float, hedged: bool, hedge_won: bool) -> None:
+        """Records a finished race: the winner's own first-chunk latency and whether it was hedged."""
+        self.latencies.record(latency)
+        with self._lock:
+            if not hedged:
+                self._hedged.append(False)  # Hedged requests were counted by try_hedge
+            self._counters["requests"] += 1
+            self._counters["hedge_wins"] += int(hedge_won)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+        stats["hedge_rate"] = stats["hedged"] / stats["requests"] if stats["requests"] else 0.0
+        delay = self.delay()
+        stats["hedge_delay"] = round(delay, 3) if delay is not None else None
+        return stats
+
+
+# Marks the end of one racing request's stream in stream_hedged
+_END = object()
+
+
+class LLMClientManager:
+    """
+    Shared ChatTogether client for the whole process.
+
+    One client (per event loop for async calls) is reused, so its HTTP
+    connection pool is reused too. At most `max_in_flight` requests run at
+    once across threads and event loops (one InFlightLimit), requests are
+    paced by a token bucket of `requests_per_second` (`burst` at once), and
+    transient failures are retried up to `max_retries` times with
+    full-jitter exponential backoff while the process-wide RetryBudget
+    allows. Streams are only retried if they fail before the first chunk.
+    With a HedgingPolicy, stream_hedged races a second request against a
+    slow first one. Keyword `params` passed to a call (model, max_tokens,
+    temperature) override the defaults for that request only, so every
+    model shares the same pool and limits.
+    """
+
+    def __init__(self, model: str, temperature: float, max_tokens: int, max_in_flight: int = 8,
+                 requests_per_second: float = 10.0, burst: float = 10.0, max_retries: int = 2,
+                 retry_budget_ratio: float = 0.1, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 timeout: float = 60.0, base_url: Optional[str] = None, hedging: Optional[HedgingPolicy] = None):
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.base_url = base_url
+        self.hedging = hedging
+        self.rate_limiter = TokenBucket(requests_per_second, burst)
+        self.retry_budget = RetryBudget(ratio=retry_budget_ratio)
+        self._slots = InFlightLimit(max_in_flight)
+        self._lock = threading.Lock()
+        self._llm: Optional[ChatTogether] = None
+        self._async_llms: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ChatTogether]" = weakref.WeakKeyDictionary()
+        self._counters = {"requests": 0, "retries": 0, "retries_denied": 0, "failures": 0, "in_flight": 0}
+        self.throttled_seconds = 0.0
+
+    # --- clients ---
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight)
+
+    def _new_llm(self, **http_clients) -> ChatTogether:
+        kwargs = {"base_url": self.base_url} if self.base_url else {}
+        return ChatTogether(
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            max_retries=0,  # Retries are coordinated here, under the retry budget
+            timeout=self.timeout,
+            **http_clients,
+            **kwargs
+        )
+
+    @property
+    def llm(self) -> ChatTogether:
+        """The shared client for synchronous calls."""
+        with self._lock:
+            if self._llm is None:
+                self._llm = self._new_llm(http_client=httpx.Client(limits=self._limits(), timeout=self.timeout))
+            return self._llm
+
+    def _async_llm(self) -> ChatTogether:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._async_llms:
+                self._async_llms[loop] = self._new_llm(http_async_client=httpx.AsyncClient(limits=self._limits(), timeout=self.timeout))
+            return self._async_llms[loop]
+
+    # --- policy ---
+    def _count(self, key: str, delta: int = 1) -> None:
+        with self._lock:
+            self._counters[key] += delta
+
+    def _start_request(self, attempt: int) -> float:
+        """Counts a request and returns the rate-limit wait before sending it."""
+        self._count("requests")
+        if attempt == 0:
+            self.retry_budget.on_request()
+        wait = self.rate_limiter.reserve()
+        if wait:
+            with self._lock:
+                self.throttled_seconds += wait
+        return wait
+
+    def _retry_delay(self, error: BaseException, attempt: int) -> Optional[float]:
+        """Backoff before the next attempt, or None if the error should be raised."""
+        if attempt >= self.max_retries or not is_transient(error):
+            self._count("failures")
+            return None
+        if not self.retry_budget.try_spend():
+            logger.warning(f"LLM retry budget exhausted, not retrying: {error}")
+            self._count("retries_denied")
+            self._count("failures")
+            return None
+        self._count("retries")
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        logger.info(f"🔁 Transient LLM error ({error}), retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+        return delay
+
+    # --- sync API ---
+    def _call(self, fn: Callable[[], Any]) -> Any:
+        attempt = 0
+        while True:
+            with self._slots:
+                self._count("in_flight")
+                try:
+                    time.sleep(self._start_request(attempt))
+                    return fn()
+                except Exception as e:
+                    error = e
+                finally:
+                    self._count("in_flight", -1)
+            delay = self._retry_delay(error, attempt)
+            if delay is None:
+                raise error
+            time.sleep(delay)
+            attempt += 1
+
+    def invoke(self, prompt: str, **params) -> str:
+        """Completion text for a prompt."""
+        return self._call(lambda: self.llm.invoke(prompt, **params).content)
+
+    def stream(self, prompt: str, **params) -> Iterator[str]:
+        """Yields completion text chunks; closing the generator closes the HTTP stream."""
+        attempt = 0
+        while True:
+            started = False
+            with self._slots:
+                self._count("in_flight")
+                chunks = None
+                try:
+                    time.sleep(self._start_request(attempt))
+                    chunks = self.llm.stream(prompt, **params)
+                    for chunk in chunks:
+                        if chunk.content:
+                            started = True
+                            yield chunk.content
+                    return
+                except Exception as e:
+                    if started:
+                        self._count("failures")
+                        raise
+                    error = e
+                finally:
+                    if chunks is not None:
+                        chunks.close()
+                    self._count("in_flight", -1)
+            delay = self._retry_delay(error, attempt)
+            if delay is None:
+                raise error
+            time.sleep(delay)
+            attempt += 1
+
+    def _race_stream(self, prompt: str, params: Dict[str, Any], index: int, events: queue.Queue, cancelled: threading.Event) -> None:
+        """Runs one racing request, putting (index, chunk, error) events until done or cancelled."""
+        chunks = self.stream(prompt, **params)
+        try:
+            for chunk in chunks:
+                events.put((index, chunk, None))
+                if cancelled.is_set():
+                    return
+            events.put((index, _END, None))
+        except Exception as e:
+            events.put((index, _END, e))
+        finally:
+            chunks.close()
+
+    def stream_hedged(self, prompt: str, **params) -> Iterator[str]:
+        """
+        stream() with hedging: if no chunk has arrived after the policy's
+        delay, an identical second request is sent and the first one to
+        produce a chunk is streamed; the other is closed.
+        """
+        policy = self.hedging
+        if policy is None:
+            yield from self.stream(prompt, **params)
+            return
+
+        events: queue.Queue = queue.Queue()
+        starts: List[float] = []
+        cancelled = [threading.Event(), threading.Event()]
+
+        def launch() -> None:
+            index = len(starts)
+            starts.append(time.monotonic())
+            threading.Thread(target=self._race_stream, args=(prompt, params, index, events, cancelled[index]),
+                             name="llm-hedge", daemon=True).start()
+
+        launch()
+        delay = policy.delay()
+        failed = 0
+        try:
+            while True:
+                timeout = None
+                if len(starts) == 1 and delay is not None:
+                    timeout = max(0.0, starts[0] + delay - time.monotonic())
+                try:
+                    winner, chunk, error = events.get(timeout=timeout)
+                except queue.Empty:
+                    if policy.try_hedge():
+                        logger.info(f"🏇 No LLM response after {delay:.2f}s, sending a hedged request")
+                        launch()
+                    else:
+                        delay = None
+                    continue
+                if error is not None:
+                    failed += 1
+                    if failed < len(starts):
+                        continue  # The other request may still succeed
+                    raise error
+                break
+
+            policy.record(time.monotonic() - starts[winner], hedged=len(starts) > 1, hedge_won=winner == 1)
+            for index in range(len(starts)):
+                if index != winner:
+                    cancelled[index].set()
+
+            while chunk is not _END:
+                yield chunk
+                index, chunk, error = events.get()
+                while index != winner:
+                    index, chunk, error = events.get()
+                if error is not None:
+                    raise error
+        finally:
+            for event in cancelled:
+                event.set()
+
+    # --- async API ---
+    async def ainvoke(self, prompt: str, **params) -> str:
+        llm = self._async_llm()
+        attempt = 0
+        while True:
+            async with self._slots:
+                self._count("in_flight")
+                try:
+                    await asyncio.sleep(self._start_request(attempt))
+                    return (await llm.ainvoke(prompt, **params)).content
+                except Exception as e:
+                    error = e
+                finally:
+                    self._count("in_flight", -1)
+            delay = self._retry_delay(error, attempt)
+            if delay is None:
+                raise error
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def astream(self, prompt: str, **params) -> AsyncIterator[str]:
+        llm = self._async_llm()
+        attempt = 0
+        while True:
+            started = False
+            async with self._slots:
+                self._count("in_flight")
+                chunks = None
+                try:
+                    await asyncio.sleep(self._start_request(attempt))
+                    chunks = llm.astream(prompt, **params)
+                    async for chunk in chunks:
+                        if chunk.content:
+                            started = True
+                            yield chunk.content
+                    return
+                except Exception as e:
+                    if started:
+                        self._count("failures")
+                        raise
+                    error = e
+                finally:
+                    if chunks is not None:
+                        await chunks.aclose()
+                    self._count("in_flight", -1)
+            delay = self._retry_delay(error, attempt)
+            if delay is None:
+                raise error
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["throttled_seconds"] = round(self.throttled_seconds, 3)
+        stats["max_in_flight"] = self.max_in_flight
+        if self.hedging is not None:
+            stats["hedging"] = self.hedging.stats()
+        return stats
@@ -443,14 +443,31 @@
 
 
 import os
+import re
 import time
+import json
+import asyncio
 import logging
-from typing import List, Dict, Optional, Tuple
+import pickle
+import hashlib
+import threading
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple, Iterator, AsyncIterator, Generator, Callable
+import numpy as np
+import faiss
 from langchain_community.vectorstores import FAISS
 from langchain_community.embeddings import SentenceTransformerEmbeddings
-from langchain_together import ChatTogether
-from langchain_core.messages import AIMessage
-from backend.web_search import search_tavily
+from backend.web_search import TavilyPrefetch, TavilyPrefetcher, search_tavily, asearch_tavily, tavily_cache
+from backend.web_index import WebCacheIndex, is_fresh
+from backend.answerability import AnswerabilityGate
+from backend.cache import LLMResponseCache, PersistentLRUCache, SemanticAnswerCache, fingerprint, normalize_query
+from backend.chunk_store import CHUNK_STORE_FILE, ChunkStoreDocstore
+from backend.context import compress_context, pack_context
+from backend.singleflight import SingleFlight
+from backend.llm_client import HedgingPolicy, LLMClientManager
+from backend.routing import QueryRouter
+from backend.index_factory import INDEX_PARAMS_FILE, apply_search_params, index_dir, load_index_params, search_parameters
 from langchain.docstore.document import Document
 
 # Set up logging
@@ -462,6 +479,26 @@ PERSISTENT_DIR = os.environ.get("PERSISTENT_STORAGE_PATH", "persistent_storage")
 DOC_FAISS_PATH = os.path.join(PERSISTENT_DIR, "doc_faiss_index")
 SCRAPED_FAISS_PATH = os.path.join(PERSISTENT_DIR, "scraped_faiss_index")
 YOUTUBE_FAISS_PATH = os.path.join(PERSISTENT_DIR, "youtube_faiss_index")
+UNIFIED_FAISS_PATH = os.path.join(PERSISTENT_DIR, "unified_faiss_index")
+WEB_CACHE_FAISS_PATH = os.path.join(PERSISTENT_DIR, "web_cache_faiss_index")  # Grown from Phase 4 results at runtime
+TIER_PARTITIONS_FILE = "tier_partitions.json"
+ANSWER_CACHE_PATH = os.path.join(PERSISTENT_DIR, "semantic_answer_cache.pkl")
+LLM_CACHE_PATH = os.path.join(PERSISTENT_DIR, "llm_response_cache.pkl")
+
+# --- Search tiers in cascade order ---
+TIERS = [
+    ("📄 Local Documents", DOC_FAISS_PATH),
+    ("🌐 Scraped Websites", SCRAPED_FAISS_PATH),
+    ("🎬 YouTube Videos", YOUTUBE_FAISS_PATH)
+]
+
+# Tier tags used by the unified index (see build_knowledge_base.build_unified_index)
+TIER_KEYS = {
+    "📄 Local Documents": "document",
+    "🌐 Scraped Websites": "web",
+    "🎬 YouTube Videos": "youtube"
+}
+WEB_CACHE_TIER = "🗄️ Web Cache"
 
 # --- Embedding Model (Load Once) ---
 try:
@@ -480,6 +517,89 @@ class SearchConfig:
     MAX_TOTAL_DOCS = 5  # Limit total documents to top 5
     TEMPERATURE = 0.3  # Lower temperature for more focused answers
     MAX_RETRIES = 3
+    LLM_MODEL = "mistralai/Mistral-7B-Instruct-v0.2"
+    LLM_MAX_TOKENS = 1000  # Ensure we get complete responses
+    # Shared LLM client limits (backend/llm_client.py)
+    LLM_MAX_IN_FLIGHT = int(os.environ.get("LLM_MAX_IN_FLIGHT", "8"))
+    LLM_REQUESTS_PER_SECOND = float(os.environ.get("LLM_REQUESTS_PER_SECOND", "10"))
+    LLM_BURST = float(os.environ.get("LLM_BURST", "10"))
+    LLM_MAX_RETRIES = 2  # Per request, for transient errors only
+    LLM_RETRY_BUDGET_RATIO = 0.1  # Process-wide retries as a share of requests
+    LLM_API_BASE = os.environ.get("TOGETHER_API_BASE") or None  # e.g. a local stand-in server
+    # Hedged requests: send a second identical request when the first is slower than recent ones
+    LLM_HEDGING = os.environ.get("LLM_HEDGING", "false").lower() == "true"
+    LLM_HEDGE_PERCENTILE = float(os.environ.get("LLM_HEDGE_PERCENTILE", "95"))  # Of recent first-chunk latencies
+    LLM_HEDGE_MAX_RATE = float(os.environ.get("LLM_HEDGE_MAX_RATE", "0.1"))  # Share of requests that may be hedged
+    LLM_HEDGE_MIN_SAMPLES = 20  # Latencies to observe before hedging at all
+    # Query-complexity routing: simple lookups with a confident top chunk go to a smaller, faster model
+    LLM_ROUTING = os.environ.get("LLM_ROUTING", "false").lower() == "true"
+    LLM_ROUTES = {
+        "fast": {
+            "model": os.environ.get("LLM_FAST_MODEL", "meta-llama/Llama-3.2-3B-Instruct-Turbo"),
+            "max_tokens": 400,
+            "temperature": 0.2
+        },
+        "full": {"model": LLM_MODEL, "max_tokens": LLM_MAX_TOKENS, "temperature": TEMPERATURE}
+    }
+    CONTEXT_TOKEN_BUDGET = int(os.environ.get("CONTEXT_TOKEN_BUDGET", "1200"))  # Prompt tokens for retrieved context
+    # Keep only the context sentences most similar to the query (extractive compression)
+    CONTEXT_COMPRESSION = os.environ.get("CONTEXT_COMPRESSION", "false").lower() == "true"
+    COMPRESSION_TOKEN_BUDGET = int(os.environ.get("COMPRESSION_TOKEN_BUDGET", "500"))
+    SENTENCE_CACHE_MAX_CHUNKS = 2000  # Chunks whose sentence embeddings compression keeps
+    STATS_LOG_EVERY = int(os.environ.get("STATS_LOG_EVERY", "50"))  # Log a pipeline_stats summary every N queries (0: never)
+    STREAM_HOLDBACK_CHARS = 120  # Streamed text held back until it is clearly not a refusal
+    # Send the top cascade prompts to the LLM concurrently instead of one after another;
+    # the highest-priority answer passing is_answer_failure wins. Costs extra LLM calls.
+    # When streaming, the current attempt streams while the next ones are answered in the background.
+    SPECULATIVE_LLM = os.environ.get("SPECULATIVE_LLM", "false").lower() == "true"
+    LLM_FANOUT = int(os.environ.get("LLM_FANOUT", "3"))  # Prompts in flight at once per query
+    # Start the Phase 4 web search right after retrieval when the best local score is weak
+    WEB_PREFETCH = os.environ.get("WEB_PREFETCH", "false").lower() == "true"
+    WEB_PREFETCH_MARGIN = float(os.environ.get("WEB_PREFETCH_MARGIN", "0.1"))  # Prefetch below DEFAULT_THRESHOLD + margin
+    # Keep Phase 4 web results in a local FAISS index and search it before Tavily
+    WEB_CACHE_INDEX = os.environ.get("WEB_CACHE_INDEX", "true").lower() == "true"
+    WEB_CACHE_THRESHOLD = 0.75  # A cached web result must match the question this well to be used
+    # Skip LLM attempts whose context is unlikely to answer (backend/answerability.py)
+    ANSWERABILITY_GATE = os.environ.get("ANSWERABILITY_GATE", "true").lower() == "true"
+    # Optional local cross-encoder for the gate, e.g. "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    ANSWERABILITY_CROSS_ENCODER = os.environ.get("ANSWERABILITY_CROSS_ENCODER") or None
+    PARALLEL_RETRIEVAL = os.environ.get("PARALLEL_RETRIEVAL", "true").lower() == "true"
+    RETRIEVAL_WORKERS = 3  # One per tier; FAISS releases the GIL while searching
+    # "memory" reads index.faiss into RAM; "mmap" maps it so workers on one host share pages (see load_faiss_index)
+    INDEX_LOAD_MODE = os.environ.get("FAISS_INDEX_LOAD_MODE", "memory").lower()
+    # Read chunks lazily from chunks.sqlite instead of unpickling index.pkl when the index has one
+    USE_CHUNK_STORE = os.environ.get("USE_CHUNK_STORE", "true").lower() == "true"
+    # Override the nprobe / efSearch saved with IVF / HNSW indexes (index_params.json)
+    IVF_NPROBE = int(os.environ["FAISS_NPROBE"]) if os.environ.get("FAISS_NPROBE") else None
+    HNSW_EF_SEARCH = int(os.environ["FAISS_EF_SEARCH"]) if os.environ.get("FAISS_EF_SEARCH") else None
+    # Search the single tier-tagged index built with BUILD_UNIFIED_INDEX=true instead of three indexes
+    USE_UNIFIED_INDEX = os.environ.get("USE_UNIFIED_INDEX", "false").lower() == "true"
+    
+    # Semantic answer cache in front of get_answer
+    ANSWER_CACHE_ENABLED = os.environ.get("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+    ANSWER_CACHE_SIMILARITY = 0.95  # Cosine similarity for two queries to count as the same question
+    ANSWER_CACHE_TTL_SECONDS = 24 * 3600
+    ANSWER_CACHE_MAX_ENTRIES = 500
+    ANSWER_CACHE_PERSIST = True  # Survive container restarts via PERSISTENT_DIR
+    # Outcomes that are worth retrying rather than replaying from cache
+    UNCACHEABLE_METHODS = {"failed", "web_raw", "web_empty", "web_error", "deadline_exceeded"}
+    
+    # Exact-match cache of LLM completions, keyed by prompt template, query, context chunks and model settings
+    LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_MAX_ENTRIES = 1000
+    LLM_CACHE_NEGATIVE_TTL_SECONDS = 3600  # Cached refusals are retried after this
+    LLM_CACHE_PERSIST = os.environ.get("LLM_CACHE_PERSIST", "true").lower() == "true"
+    
+    # aget_answer: overall time budget per query, and the most a single phase may take of it (seconds)
+    ANSWER_DEADLINE_SECONDS = float(os.environ.get("ANSWER_DEADLINE_SECONDS", "30"))
+    PHASE_TIMEOUTS = {"retrieval": 5.0, "llm": 12.0, "web_search": 8.0}
+    
+    # Cascade phases in order; a candidate qualifies for the first phase whose threshold it beats
+    PHASES = [
+        ("standard", DEFAULT_THRESHOLD),
+        ("relaxed", RELAXED_THRESHOLD),
+        ("emergency", EMERGENCY_THRESHOLD)
+    ]
     
     # Enhanced failure detection phrases
     FAILURE_PHRASES = [
@@ -500,36 +620,295 @@ class SearchConfig:
     ]
 
 
-def search_vectorstore(index_path: str, query: str, threshold: float = SearchConfig.DEFAULT_THRESHOLD) -> Tuple[List[Document], List[float]]:
-    """Loads a FAISS index and returns top 5 relevant documents with similarity scores."""
+# --- FAISS Index Loading ---
+def load_faiss_index(index_path: str, mode: str = SearchConfig.INDEX_LOAD_MODE, use_chunk_store: bool = SearchConfig.USE_CHUNK_STORE) -> FAISS:
+    """
+    Loads a saved FAISS index for querying.
+
+    mode="memory" is FAISS.load_local: index.faiss is read into process RAM.
+    mode="mmap" opens index.faiss read-only with FAISS's mmap I/O flags, so
+    several Streamlit workers on one host share the same page-cache pages
+    instead of each holding a private copy. Support depends on index type:
+
+    - Flat indexes (IndexFlatL2/IndexFlatIP, what FAISS.from_documents builds)
+      are mapped through IO_FLAG_MMAP_IFC, available from faiss-cpu 1.10.
+      Older faiss builds silently read them into RAM.
+    - IVF indexes (IVF-Flat, IVF-PQ, built with FAISS_INDEX_TYPE) map their
+      inverted lists with IO_FLAG_MMAP; the coarse quantizer is read into RAM.
+    - HNSW graphs are always read into RAM.
+
+    With use_chunk_store=True and a chunks.sqlite next to the index (written by
+    build_knowledge_base.py), chunk text and metadata are read lazily from it,
+    one row per returned result. Otherwise the whole docstore in index.pkl is
+    unpickled into memory.
+
+    Search parameters saved by the builder (nprobe for IVF, efSearch for HNSW)
+    are applied to the loaded index.
+    """
+    vectordb = _read_vectorstore(index_path, mode, use_chunk_store)
+    apply_search_params(vectordb.index, load_index_params(index_path), SearchConfig.IVF_NPROBE, SearchConfig.HNSW_EF_SEARCH)
+    return vectordb
+
+
+def _read_vectorstore(index_path: str, mode: str, use_chunk_store: bool) -> FAISS:
+    faiss_file = os.path.join(index_path, "index.faiss")
+    chunk_store_file = os.path.join(index_path, CHUNK_STORE_FILE)
+    use_chunk_store = use_chunk_store and os.path.exists(chunk_store_file)
+
+    if mode != "mmap" and not use_chunk_store:
+        return FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
+
+    index = None
+    if mode == "mmap":
+        flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY | getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+        try:
+            index = faiss.read_index(faiss_file, flags)
+        except Exception as e:
+            logger.warning(f"mmap load failed for {index_path} ({e}), reading it into memory instead")
+    if index is None:
+        index = faiss.read_index(faiss_file)
+
+    if use_chunk_store:
+        docstore = ChunkStoreDocstore(chunk_store_file)
+        index_to_docstore_id = docstore.index_to_docstore_id()
+        if len(index_to_docstore_id) == index.ntotal:
+            return FAISS(embedding_function=embeddings, index=index, docstore=docstore, index_to_docstore_id=index_to_docstore_id)
+        logger.warning(f"Chunk store for {index_path} has {len(index_to_docstore_id)} chunks but the index has "
+                       f"{index.ntotal} vectors, falling back to index.pkl")
+
+    with open(os.path.join(index_path, "index.pkl"), "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+    return FAISS(embedding_function=embeddings, index=index, docstore=docstore, index_to_docstore_id=index_to_docstore_id)
+
+
+# --- FAISS Index Registry (Load Once per Process) ---
+class IndexRegistry:
+    """Process-wide cache of loaded FAISS indexes, shared by every Streamlit session.
+
+    An index is loaded on first use and reloaded only when the mtime or size of
+    one of its files changes on disk (e.g. after build_knowledge_base.py runs),
+    or when its CURRENT file switches to another version (see index_dir).
+    """
+
+    INDEX_FILES = ("index.faiss", "index.pkl", CHUNK_STORE_FILE, TIER_PARTITIONS_FILE, INDEX_PARAMS_FILE)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self._entries: Dict[str, Dict] = {}
+
+    def _signature(self, index_path: str, directory: Optional[str] = None) -> Optional[Tuple]:
+        """Returns (path, mtime, size) for each index file, or None if the index is missing."""
+        directory = directory or index_dir(index_path)
+        signature = []
+        for name in self.INDEX_FILES:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                if name == "index.faiss":
+                    return None
+                continue
+            signature.append((os.path.relpath(path, index_path), stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _path_lock(self, index_path: str) -> threading.Lock:
+        with self._lock:
+            return self._path_locks.setdefault(index_path, threading.Lock())
+
+    def get(self, index_path: str) -> Optional[FAISS]:
+        """Returns the loaded index for index_path, (re)loading it only if its files changed."""
+        directory = index_dir(index_path)
+        signature = self._signature(index_path, directory)
+        if signature is None:
+            return None
+
+        entry = self._entries.get(index_path)
+        if entry and entry["signature"] == signature:
+            return entry["vectordb"]
+
+        # One loader per index; other sessions wait and then reuse its result
+        with self._path_lock(index_path):
+            entry = self._entries.get(index_path)
+            if entry and entry["signature"] == signature:
+                return entry["vectordb"]
+
+            start = time.perf_counter()
+            vectordb = load_faiss_index(directory)
+            load_seconds = time.perf_counter() - start
+            size_bytes = sum(size for _, _, size in signature)
+
+            partitions = None
+            partitions_file = os.path.join(directory, TIER_PARTITIONS_FILE)
+            if os.path.exists(partitions_file):
+                with open(partitions_file, "r", encoding="utf-8") as f:
+                    partitions = json.load(f)
+
+            self._entries[index_path] = {
+                "vectordb": vectordb,
+                "partitions": partitions,
+                "signature": signature,
+                "load_seconds": load_seconds,
+                "size_bytes": size_bytes,
+                "num_vectors": vectordb.index.ntotal,
+                "load_mode": SearchConfig.INDEX_LOAD_MODE,
+                "loaded_at": time.time(),
+                "load_count": (entry["load_count"] + 1) if entry else 1
+            }
+            action = "Reloaded" if entry else "Loaded"
+            logger.info(f"📦 {action} {os.path.basename(index_path)} in {load_seconds:.2f}s "
+                        f"({size_bytes / (1024 * 1024):.1f} MB, {vectordb.index.ntotal} vectors)")
+            return vectordb
+
+    def partitions(self, index_path: str) -> Optional[Dict[str, List[int]]]:
+        """Tier -> [start, end) FAISS id range of a unified index, or None for single-tier indexes."""
+        if self.get(index_path) is None:
+            return None
+        return self._entries[index_path]["partitions"]
+
+    def version(self, index_paths: List[str]) -> str:
+        """Fingerprint of the on-disk state of the given indexes; changes whenever one is rebuilt."""
+        signatures = [(path, self._signature(path)) for path in index_paths]
+        return hashlib.md5(repr(signatures).encode("utf-8")).hexdigest()
+
+    def put(self, index_path: str, vectordb: FAISS) -> None:
+        """Registers an index just written to index_path, so it is used without being read back from disk."""
+        signature = self._signature(index_path)
+        with self._path_lock(index_path):
+            entry = self._entries.get(index_path)
+            self._entries[index_path] = {
+                "vectordb": vectordb,
+                "partitions": None,
+                "signature": signature,
+                "load_seconds": 0.0,
+                "size_bytes": sum(size for _, _, size in signature or ()),
+                "num_vectors": vectordb.index.ntotal,
+                "load_mode": "memory",
+                "loaded_at": time.time(),
+                "load_count": (entry["load_count"] + 1) if entry else 1
+            }
+
+    def stats(self) -> Dict[str, Dict]:
+        """Returns load time, size and vector count for every loaded index."""
+        return {
+            path: {key: value for key, value in entry.items() if key not in ("vectordb", "partitions", "signature")}
+            for path, entry in list(self._entries.items())
+        }
+
+    def clear(self) -> None:
+        """Drops all loaded indexes; the next search reloads them from disk."""
+        with self._lock:
+            self._entries.clear()
+
+
+index_registry = IndexRegistry()
+
+# Phase 2 and 3: (phase, threshold, attempt type, tier label) over all tiers combined
+COMBINED_PHASES = [
+    ("relaxed", SearchConfig.RELAXED_THRESHOLD, "combined_relaxed", "Combined Sources (Relaxed)"),
+    ("emergency", SearchConfig.EMERGENCY_THRESHOLD, "emergency_combined", "Emergency Search (Very Relaxed)")
+]
+
+
+def active_index_paths() -> List[str]:
+    """
+    Index directories the retrieval step currently reads. The web cache
+    index is left out: it changes with every web search, and including it
+    in the answer cache version would drop the cache each time.
+    """
+    if SearchConfig.USE_UNIFIED_INDEX and os.path.exists(os.path.join(UNIFIED_FAISS_PATH, "index.faiss")):
+        return [UNIFIED_FAISS_PATH]
+    return [index_path for _, index_path in TIERS]
+
+answer_cache = SemanticAnswerCache(
+    threshold=SearchConfig.ANSWER_CACHE_SIMILARITY,
+    ttl_seconds=SearchConfig.ANSWER_CACHE_TTL_SECONDS,
+    max_entries=SearchConfig.ANSWER_CACHE_MAX_ENTRIES,
+    persist_path=ANSWER_CACHE_PATH if SearchConfig.ANSWER_CACHE_PERSIST else None
+)
+# Identical prompts (same template, query, chunks and model settings) reuse the earlier completion
+llm_response_cache = LLMResponseCache(
+    max_entries=SearchConfig.LLM_CACHE_MAX_ENTRIES,
+    persist_path=LLM_CACHE_PATH if SearchConfig.LLM_CACHE_PERSIST else None,
+    negative_ttl_seconds=SearchConfig.LLM_CACHE_NEGATIVE_TTL_SECONDS
+)
+# Sentence embeddings of context chunks, so each cascade attempt only embeds chunks it has not seen
+sentence_embedding_cache = PersistentLRUCache(max_entries=SearchConfig.SENTENCE_CACHE_MAX_CHUNKS)
+# Concurrent identical questions (after normalize_query) share one cascade run
+answer_flights = SingleFlight()
+answerability_gate = AnswerabilityGate(
+    enabled=SearchConfig.ANSWERABILITY_GATE,
+    cross_encoder_model=SearchConfig.ANSWERABILITY_CROSS_ENCODER
+)
+query_router = QueryRouter(enabled=SearchConfig.LLM_ROUTING)
+
+
+@lru_cache(maxsize=256)
+def embed_query(query: str) -> np.ndarray:
+    """
+    Runs the embedding model once and returns the L2-normalized query vector.
+    Memoized, so later stages of the same query (e.g. context compression)
+    reuse the vector instead of embedding again.
+    """
+    vector = np.asarray(embeddings.embed_query(query), dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """Embeds texts in one batch; rows are L2-normalized."""
+    matrix = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+def _search_by_vector(vectordb: FAISS, query_embedding: np.ndarray, k: int, id_range: Optional[Tuple[int, int]] = None) -> List[Tuple[Document, float]]:
+    """Top-k (document, distance) pairs, optionally restricted to FAISS ids in [start, end) by an id selector."""
+    if id_range is None:
+        return vectordb.similarity_search_with_score_by_vector(query_embedding, k=k)
+
+    selector = faiss.IDSelectorRange(int(id_range[0]), int(id_range[1]))
+    params = search_parameters(vectordb.index, selector)
+    distances, ids = vectordb.index.search(np.asarray([query_embedding], dtype=np.float32), k, params=params)
+
+    results = []
+    for distance, faiss_id in zip(distances[0], ids[0]):
+        if faiss_id == -1:
+            continue
+        doc = vectordb.docstore.search(vectordb.index_to_docstore_id[int(faiss_id)])
+        if isinstance(doc, Document):
+            results.append((doc, float(distance)))
+    return results
+
+
+def search_scored(index_path: str, query_embedding: np.ndarray, k: int = SearchConfig.MAX_DOCS_PER_TIER, id_range: Optional[Tuple[int, int]] = None) -> List[Tuple[Document, float]]:
+    """Returns the top-k (document, relevance score) pairs of an index without any threshold applied.
+
+    id_range limits the search to one tier's partition of a unified index.
+    """
     for attempt in range(SearchConfig.MAX_RETRIES):
         try:
             if not os.path.exists(index_path):
                 logger.warning(f"Index directory not found: {index_path}")
-                return [], []
+                return []
                 
-            faiss_file = os.path.join(index_path, "index.faiss")
+            faiss_file = os.path.join(index_dir(index_path), "index.faiss")
             if not os.path.exists(faiss_file):
                 logger.warning(f"FAISS index file not found: {faiss_file}")
-                return [], []
-
-            vectordb = FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
-            results = vectordb.similarity_search_with_relevance_scores(query, k=SearchConfig.MAX_DOCS_PER_TIER)
-            
-            # Filter by threshold and get top 5
-            relevant_results = [(doc, score) for doc, score in results if score > threshold]
-            relevant_results = relevant_results[:5]  # Limit to top 5
-            
-            relevant_docs = [doc for doc, score in relevant_results]
-            similarity_scores = [score for doc, score in relevant_results]
-            
-            logger.info(f"Found {len(relevant_docs)}/5 relevant docs in {os.path.basename(index_path)} (threshold: {threshold})")
-            
-            # Log top scores for debugging
-            if similarity_scores:
-                logger.debug(f"Top 5 similarity scores: {similarity_scores}")
-            
-            return relevant_docs, similarity_scores
+                return []
+
+            vectordb = index_registry.get(index_path)
+            if vectordb is None:
+                logger.warning(f"FAISS index could not be loaded: {index_path}")
+                return []
+
+            # Same relevance scoring as similarity_search_with_relevance_scores, minus the re-embedding
+            relevance_fn = vectordb._select_relevance_score_fn()
+            results = [
+                (doc, relevance_fn(distance))
+                for doc, distance in _search_by_vector(vectordb, query_embedding, k, id_range)
+            ]
+            return results
             
         except Exception as e:
             logger.error(f"Attempt {attempt + 1} failed for {index_path}: {e}")
@@ -537,9 +916,172 @@ def search_vectorstore(index_path: str, query: str, threshold: float = SearchCon
                 time.sleep(1)  # Brief pause before retry
             else:
                 logger.error(f"All attempts failed for vectorstore search in {index_path}")
-                return [], []
+                return []
     
-    return [], []
+    return []
+
+
+def qualifying_phase(score: float) -> Optional[str]:
+    """Returns the earliest cascade phase whose threshold the score beats, or None."""
+    for phase, threshold in SearchConfig.PHASES:
+        if score > threshold:
+            return phase
+    return None
+
+
+class RetrievalResult:
+    """Scored candidates from a single search per index, shared by every cascade phase.
+
+    Each candidate is a dict with "document", "score", "tier" and "phase" (the
+    earliest phase it qualifies for, or None). Candidates are sorted by score.
+    tier_timings holds the search time of each tier in seconds.
+    """
+
+    def __init__(self, query_embedding: np.ndarray, candidates: List[Dict], tier_timings: Optional[Dict[str, float]] = None, elapsed: float = 0.0):
+        self.query_embedding = query_embedding
+        self.candidates = candidates
+        self.tier_timings = tier_timings or {}
+        self.elapsed = elapsed
+
+    def tier_candidates(self, tier_name: str, threshold: float, limit: int = 5) -> Tuple[List[Document], List[float]]:
+        """Top documents of one tier scoring above threshold."""
+        selected = [c for c in self.candidates if c["tier"] == tier_name and c["score"] > threshold][:limit]
+        return [c["document"] for c in selected], [c["score"] for c in selected]
+
+    def combined_candidates(self, threshold: float, limit: int = SearchConfig.MAX_TOTAL_DOCS) -> Tuple[List[Document], List[float]]:
+        """Top documents across all tiers scoring above threshold."""
+        selected = [c for c in self.candidates if c["score"] > threshold][:limit]
+        return [c["document"] for c in selected], [c["score"] for c in selected]
+
+    def phase_counts(self) -> Dict[str, int]:
+        """Number of candidates first qualifying for each phase."""
+        counts = {phase: 0 for phase, _ in SearchConfig.PHASES}
+        for candidate in self.candidates:
+            if candidate["phase"]:
+                counts[candidate["phase"]] += 1
+        return counts
+
+
+_retrieval_executor = ThreadPoolExecutor(max_workers=SearchConfig.RETRIEVAL_WORKERS, thread_name_prefix="tier-search")
+_llm_executor = ThreadPoolExecutor(max_workers=SearchConfig.LLM_MAX_IN_FLIGHT, thread_name_prefix="llm-speculative")
+web_prefetcher = TavilyPrefetcher()
+web_cache_index = WebCacheIndex(WEB_CACHE_FAISS_PATH, embeddings, index_registry)
+
+
+def _make_candidate(doc: Document, score: float, tier_name: str) -> Dict:
+    # Copy so the registry's shared docstore entries are never mutated
+    tagged_doc = Document(page_content=doc.page_content, metadata={**doc.metadata, "tier": tier_name})
+    return {
+        "document": tagged_doc,
+        "score": score,
+        "tier": tier_name,
+        "phase": qualifying_phase(score)
+    }
+
+
+def _tier_candidates(tier_name: str, index_path: str, query_embedding: np.ndarray) -> Tuple[List[Dict], float]:
+    """Scored candidates of one tier plus the time the search took."""
+    start = time.perf_counter()
+    candidates = []
+    try:
+        candidates = [_make_candidate(doc, score, tier_name) for doc, score in search_scored(index_path, query_embedding)]
+    except Exception as e:
+        logger.error(f"Error retrieving candidates from {tier_name}: {e}")
+    return candidates, time.perf_counter() - start
+
+
+def _unified_tier_candidates(query_embedding: np.ndarray, tiers: List[Tuple[str, str]]) -> Tuple[List[List[Dict]], Dict[str, float]]:
+    """
+    Per-tier candidates from the unified index, usually with a single search.
+
+    All tiers are searched at once for k results per tier and the hits are
+    split by their tier tag. A tier only gets a follow-up search, restricted
+    to its id range, when it came up short and the global list was cut off
+    above the emergency threshold - otherwise nothing unseen could qualify.
+    """
+    k = SearchConfig.MAX_DOCS_PER_TIER
+    k_all = k * len(tiers)
+    partitions = index_registry.partitions(UNIFIED_FAISS_PATH) or {}
+
+    start = time.perf_counter()
+    results = search_scored(UNIFIED_FAISS_PATH, query_embedding, k=k_all)
+    timings = {"All tiers (unified)": time.perf_counter() - start}
+    truncated = len(results) == k_all and results[-1][1] > SearchConfig.EMERGENCY_THRESHOLD
+
+    tier_lists = []
+    for tier_name, _ in tiers:
+        tier_key = TIER_KEYS.get(tier_name)
+        hits = [(doc, score) for doc, score in results if doc.metadata.get("tier_key") == tier_key][:k]
+        id_range = partitions.get(tier_key)
+        if truncated and len(hits) < k and id_range and id_range[1] - id_range[0] > len(hits):
+            start = time.perf_counter()
+            hits = search_scored(UNIFIED_FAISS_PATH, query_embedding, k=k, id_range=tuple(id_range))
+            timings[tier_name] = time.perf_counter() - start
+        tier_lists.append([_make_candidate(doc, score, tier_name) for doc, score in hits])
+    return tier_lists, timings
+
+
+def retrieve_candidates(query_embedding: np.ndarray, tiers: List[Tuple[str, str]] = TIERS, parallel: bool = SearchConfig.PARALLEL_RETRIEVAL) -> RetrievalResult:
+    """Searches each tier's index once and keeps every scored candidate for all phases.
+
+    With parallel=True the tiers are searched concurrently on a bounded thread
+    pool, so retrieval takes about as long as the slowest tier. When
+    SearchConfig.USE_UNIFIED_INDEX is set and a unified index exists, all tiers
+    are searched through that one index instead.
+    """
+    start = time.perf_counter()
+    if active_index_paths() == [UNIFIED_FAISS_PATH]:
+        mode = "unified"
+        tier_lists, tier_timings = _unified_tier_candidates(query_embedding, tiers)
+    else:
+        if parallel and len(tiers) > 1:
+            mode = "parallel"
+            futures = [_retrieval_executor.submit(_tier_candidates, tier_name, index_path, query_embedding) for tier_name, index_path in tiers]
+            tier_results = [future.result() for future in futures]
+        else:
+            mode = "sequential"
+            tier_results = [_tier_candidates(tier_name, index_path, query_embedding) for tier_name, index_path in tiers]
+        tier_lists = [tier_candidates for tier_candidates, _ in tier_results]
+        tier_timings = {tier_name: seconds for (tier_name, _), (_, seconds) in zip(tiers, tier_results)}
+
+    candidates = [candidate for tier_candidates in tier_lists for candidate in tier_candidates]
+
+    # Stable sort keeps tier order among equal scores
+    candidates.sort(key=lambda c: c["score"], reverse=True)
+    retrieval = RetrievalResult(query_embedding, candidates, tier_timings, time.perf_counter() - start)
+    timings = ", ".join(f"{name}: {seconds * 1000:.0f}ms" for name, seconds in tier_timings.items())
+    logger.info(f"Retrieved {len(candidates)} candidates from {len(tiers)} tiers in {retrieval.elapsed * 1000:.0f}ms "
+                f"({mode}; {timings}; by phase: {retrieval.phase_counts()})")
+    return retrieval
+
+
+# All failure phrases as one case-insensitive alternation, so a single scan finds any of them
+FAILURE_PATTERN = re.compile("|".join(re.escape(phrase) for phrase in SearchConfig.FAILURE_PHRASES), re.IGNORECASE)
+MAX_FAILURE_PHRASE_CHARS = max(len(phrase) for phrase in SearchConfig.FAILURE_PHRASES)
+
+
+class FailurePhraseMatcher:
+    """
+    Incremental FAILURE_PATTERN search over streamed text.
+
+    feed() only rescans the last MAX_FAILURE_PHRASE_CHARS - 1 characters
+    seen before plus the new chunk, so checking a whole generation costs
+    about one pass over it, and a phrase split across chunks is still found.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.match: Optional[str] = None
+
+    def feed(self, chunk: str) -> bool:
+        """Appends a chunk; True once a failure phrase has appeared."""
+        start = max(0, len(self.text) - MAX_FAILURE_PHRASE_CHARS + 1)
+        self.text += chunk
+        if self.match is None:
+            found = FAILURE_PATTERN.search(self.text, start)
+            if found:
+                self.match = found.group(0)
+        return self.match is not None
 
 
 def is_answer_failure(answer_text: str) -> bool:
@@ -550,10 +1092,10 @@ def is_answer_failure(answer_text: str) -> bool:
     answer_lower = answer_text.lower().strip()
     
     # Check for failure phrases
-    for phrase in SearchConfig.FAILURE_PHRASES:
-        if phrase in answer_lower:
-            logger.debug(f"Failure phrase detected: '{phrase}'")
-            return True
+    found = FAILURE_PATTERN.search(answer_text)
+    if found:
+        logger.debug(f"Failure phrase detected: '{found.group(0)}'")
+        return True
     
     # Check for very short answers (likely incomplete)
     if len(answer_text.strip()) < 15:
@@ -574,18 +1116,22 @@ def is_answer_failure(answer_text: str) -> bool:
     return False
 
 
-def ask_llm(query: str, context_docs: List[Document], similarity_scores: List[float], attempt_type: str = "standard") -> Optional[Dict]:
-    """Enhanced LLM querying with similarity scores and top 5 limitation."""
-    if not context_docs:
-        logger.warning("No context documents provided to LLM")
-        return None
-        
-    # Already limited to top 5, but double-check
-    if len(context_docs) > 5:
-        context_docs = context_docs[:5]
-        similarity_scores = similarity_scores[:5] if similarity_scores else [None] * 5
-        logger.info(f"Truncated context to top 5 documents")
-        
+def prompt_template(attempt_type: str) -> str:
+    """Name of the prompt template used for an attempt type."""
+    if attempt_type in ("web_fallback", "web_cache"):
+        return "web_fallback"
+    return attempt_type if attempt_type == "combined_relaxed" else "standard"
+
+
+def build_llm_prompt(query: str, context_docs: List[Document], similarity_scores: List[float], attempt_type: str = "standard") -> str:
+    """Formats the ranked context and fills the prompt template for the attempt type."""
+    # Merge overlapping chunks and keep the best ones that fit the token budget
+    context_docs, similarity_scores = pack_context(context_docs, similarity_scores, SearchConfig.CONTEXT_TOKEN_BUDGET)
+    if SearchConfig.CONTEXT_COMPRESSION:
+        context_docs, similarity_scores = compress_context(context_docs, similarity_scores, embed_query(query),
+                                                           embed_texts, SearchConfig.COMPRESSION_TOKEN_BUDGET,
+                                                           sentence_embedding_cache, _chunk_id)
+    
     # Build context with better formatting and similarity scores
     context_parts = []
     for i, (doc, score) in enumerate(zip(context_docs, similarity_scores), 1):
@@ -610,7 +1156,8 @@ def ask_llm(query: str, context_docs: List[Document], similarity_scores: List[fl
     context = "\n\n".join(context_parts)
     
     # Enhanced prompts based on attempt type
-    if attempt_type == "web_fallback":
+    template = prompt_template(attempt_type)
+    if template == "web_fallback":
         prompt = f"""You are a knowledgeable assistant helping with questions about MeitY (Ministry of Electronics and IT, India). I found the top 5 most relevant sources from the internet based on similarity scores.
 
 Top 5 Web Search Results:
@@ -620,7 +1167,7 @@ Question: {query}
 
 Please provide a comprehensive and accurate answer based on these top-ranked search results. Focus on MeitY-related information and be specific. Prioritize information from higher-scoring sources."""
 
-    elif attempt_type == "combined_relaxed":
+    elif template == "combined_relaxed":
         prompt = f"""You are a knowledgeable assistant specializing in MeitY (Ministry of Electronics and IT, India) topics. I'm providing you with the top 5 most relevant sources from multiple sources (documents, websites, videos) ranked by similarity.
 
 Top 5 Combined Sources:
@@ -639,223 +1186,942 @@ Top 5 Sources (ranked by relevance):
 Question: {query}
 
 Please provide a comprehensive answer based on these top-ranked sources. Prioritize information from higher-scoring sources and be specific with details."""
+    
+    return prompt
+
+
+# One pooled, rate-limited client for every LLM call in the process
+llm_client = LLMClientManager(
+    model=SearchConfig.LLM_MODEL,
+    temperature=SearchConfig.TEMPERATURE,
+    max_tokens=SearchConfig.LLM_MAX_TOKENS,
+    max_in_flight=SearchConfig.LLM_MAX_IN_FLIGHT,
+    requests_per_second=SearchConfig.LLM_REQUESTS_PER_SECOND,
+    burst=SearchConfig.LLM_BURST,
+    max_retries=SearchConfig.LLM_MAX_RETRIES,
+    retry_budget_ratio=SearchConfig.LLM_RETRY_BUDGET_RATIO,
+    base_url=SearchConfig.LLM_API_BASE,
+    hedging=HedgingPolicy(
+        percentile=SearchConfig.LLM_HEDGE_PERCENTILE,
+        max_hedge_rate=SearchConfig.LLM_HEDGE_MAX_RATE,
+        min_samples=SearchConfig.LLM_HEDGE_MIN_SAMPLES
+    ) if SearchConfig.LLM_HEDGING else None
+)
+
+
+def stream_llm(prompt: str, **params) -> Iterator[str]:
+    """Yields answer text chunks as the LLM generates them (hedged if SearchConfig.LLM_HEDGING)."""
+    yield from llm_client.stream_hedged(prompt, **params)
+
+
+async def astream_llm(prompt: str, **params) -> AsyncIterator[str]:
+    async for chunk in llm_client.astream(prompt, **params):
+        yield chunk
+
+
+def llm_params(query: str, context_docs: List[Document], similarity_scores: List[float], attempt_type: str) -> Dict:
+    """Model, max_tokens and temperature of the SearchConfig.LLM_ROUTES route picked for an attempt."""
+    return SearchConfig.LLM_ROUTES[query_router.route(query, context_docs, similarity_scores, attempt_type)]
+
+
+def _chunk_id(doc: Document) -> str:
+    """Identifies a context chunk by its source position and a hash of its text."""
+    metadata = doc.metadata
+    content_hash = hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest()[:16]
+    return f"{metadata.get('source', '')}|{metadata.get('page', '')}|{metadata.get('start_index', '')}|{content_hash}"
+
+
+def llm_cache_key(query: str, context_docs: List[Document], attempt_type: str, params: Dict) -> str:
+    """
+    Cache key for the completion of one prompt: template, query, ordered
+    chunk ids, the model parameters (see llm_params) and the context packing
+    settings that shape the prompt. Similarity scores are left out - they
+    only annotate chunks.
+    """
+    return fingerprint(
+        prompt_template(attempt_type),
+        query.strip(),
+        [_chunk_id(doc) for doc in context_docs],
+        params,
+        SearchConfig.CONTEXT_TOKEN_BUDGET,
+        SearchConfig.CONTEXT_COMPRESSION and SearchConfig.COMPRESSION_TOKEN_BUDGET
+    )
+
+
+def cached_llm_response(cache_key: str, attempt_type: str) -> Optional[Dict]:
+    """
+    Returns {"answer": text} for a prompt answered before, or None on a
+    miss. An answer of None means the earlier generation was aborted on a
+    failure phrase, so the attempt can be skipped without calling the LLM.
+    """
+    if not SearchConfig.LLM_CACHE_ENABLED:
+        return None
+    cached = llm_response_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"💾 LLM response cache hit for {attempt_type}")
+    return cached
+
 
+def store_llm_response(cache_key: str, answer_text: Optional[str]) -> None:
+    if SearchConfig.LLM_CACHE_ENABLED:
+        llm_response_cache.put(cache_key, {"answer": answer_text})
+
+
+class GenerationCancelled(Exception):
+    """Raised by generate_answer when its cancel event is set."""
+
+
+def generate_answer(prompt: str, attempt_type: str, params: Optional[Dict] = None,
+                    cancel: Optional[threading.Event] = None) -> Optional[str]:
+    """
+    Streams a completion and aborts it as soon as a failure phrase appears,
+    so refusals are neither waited for nor paid for in full. Setting
+    `cancel` closes the stream at the next chunk and raises
+    GenerationCancelled.
+
+    Returns:
+        The generated text, or None if the generation was aborted
+    """
+    matcher = FailurePhraseMatcher()
+    stream = stream_llm(prompt, **(params or {}))
     try:
-        llm = ChatTogether(
-            model="mistralai/Mistral-7B-Instruct-v0.2", 
-            temperature=SearchConfig.TEMPERATURE,
-            max_tokens=1000  # Ensure we get complete responses
-        )
-        
-        logger.info(f"Querying LLM with top {len(context_docs)} documents for {attempt_type}")
-        response = llm.invoke(prompt)
-        answer_text = response.content.strip() if isinstance(response, AIMessage) else str(response).strip()
+        for chunk in stream:
+            if cancel is not None and cancel.is_set():
+                raise GenerationCancelled(attempt_type)
+            if matcher.feed(chunk):
+                logger.info(f"✂️ Aborted {attempt_type} generation after {len(matcher.text)} chars: '{matcher.match}'")
+                return None
+    finally:
+        stream.close()
+    return matcher.text
+
+
+async def agenerate_answer(prompt: str, attempt_type: str, params: Optional[Dict] = None) -> Optional[str]:
+    """Async generate_answer over ChatTogether.astream."""
+    matcher = FailurePhraseMatcher()
+    stream = astream_llm(prompt, **(params or {}))
+    try:
+        async for chunk in stream:
+            if matcher.feed(chunk):
+                logger.info(f"✂️ Aborted {attempt_type} generation after {len(matcher.text)} chars: '{matcher.match}'")
+                return None
+    finally:
+        await stream.aclose()
+    return matcher.text
 
-        if is_answer_failure(answer_text):
-            logger.info(f"LLM indicated insufficient context for {attempt_type} attempt")
+
+def ask_llm(query: str, context_docs: List[Document], similarity_scores: List[float], attempt_type: str = "standard",
+            cancel: Optional[threading.Event] = None) -> Optional[Dict]:
+    """Enhanced LLM querying with similarity scores and top 5 limitation."""
+    if not context_docs:
+        logger.warning("No context documents provided to LLM")
+        return None
+        
+    # Already limited to top 5, but double-check
+    if len(context_docs) > 5:
+        context_docs = context_docs[:5]
+        similarity_scores = similarity_scores[:5] if similarity_scores else [None] * 5
+        logger.info(f"Truncated context to top 5 documents")
+        
+    params = llm_params(query, context_docs, similarity_scores, attempt_type)
+    cache_key = llm_cache_key(query, context_docs, attempt_type, params)
+    cached = cached_llm_response(cache_key, attempt_type)
+    if cached is not None:
+        if cached["answer"] is None:
             return None
+        return _answer_result(cached["answer"], context_docs, similarity_scores, attempt_type)
 
-        logger.info(f"✅ Successfully generated answer using {attempt_type} approach")
-        return {
-            "answer": answer_text,
-            "source_documents": context_docs,
-            "similarity_scores": similarity_scores,
-            "search_method": attempt_type
-        }
+    prompt = build_llm_prompt(query, context_docs, similarity_scores, attempt_type)
+
+    try:
+        logger.info(f"Querying LLM ({params['model']}) with top {len(context_docs)} documents for {attempt_type}")
+        answer_text = generate_answer(prompt, attempt_type, params, cancel)
+        store_llm_response(cache_key, answer_text)
+        if answer_text is None:
+            return None
+        return _answer_result(answer_text, context_docs, similarity_scores, attempt_type)
         
+    except GenerationCancelled:
+        logger.info(f"🛑 Cancelled {attempt_type} LLM call, another attempt answered first")
+        return None
     except Exception as e:
         logger.error(f"Error calling LLM for {attempt_type}: {e}")
         return None
 
 
-def search_tier(tier_name: str, index_path: str, query: str, threshold: float = SearchConfig.DEFAULT_THRESHOLD) -> Optional[Dict]:
-    """Search a single tier and return top 5 results with similarity scores."""
-    logger.info(f"🔍 Searching {tier_name}...")
+async def aask_llm(query: str, context_docs: List[Document], similarity_scores: List[float], attempt_type: str = "standard") -> Optional[Dict]:
+    """Async ask_llm: awaits ChatTogether.astream instead of blocking a thread."""
+    if not context_docs:
+        logger.warning("No context documents provided to LLM")
+        return None
+    
+    context_docs = context_docs[:5]
+    similarity_scores = similarity_scores[:5]
+    params = llm_params(query, context_docs, similarity_scores, attempt_type)
+    cache_key = llm_cache_key(query, context_docs, attempt_type, params)
+    cached = cached_llm_response(cache_key, attempt_type)
+    if cached is not None:
+        if cached["answer"] is None:
+            return None
+        return _answer_result(cached["answer"], context_docs, similarity_scores, attempt_type)
+
+    # Packing and compression tokenize and embed; keep them off the event loop
+    prompt = await asyncio.to_thread(build_llm_prompt, query, context_docs, similarity_scores, attempt_type)
     
     try:
-        sources, scores = search_vectorstore(index_path, query, threshold)
-        if sources:
-            result = ask_llm(query, sources, scores, tier_name.lower().replace(" ", "_").replace("📄", "").replace("🌐", "").replace("🎬", "").strip())
-            if result:
-                logger.info(f"✅ Found answer in {tier_name}")
-                result["tier"] = tier_name
-                return result
-            else:
-                logger.info(f"❌ {tier_name} had {len(sources)} relevant docs but LLM couldn't generate answer")
+        logger.info(f"Querying LLM (async, {params['model']}) with top {len(context_docs)} documents for {attempt_type}")
+        answer_text = await agenerate_answer(prompt, attempt_type, params)
+        store_llm_response(cache_key, answer_text)
+        if answer_text is None:
+            return None
+        return _answer_result(answer_text, context_docs, similarity_scores, attempt_type)
+    except Exception as e:
+        logger.error(f"Error calling LLM for {attempt_type}: {e}")
+        return None
+
+
+def _answer_result(answer_text: str, context_docs: List[Document], similarity_scores: List[float], attempt_type: str) -> Optional[Dict]:
+    answer_text = answer_text.strip()
+
+    if is_answer_failure(answer_text):
+        logger.info(f"LLM indicated insufficient context for {attempt_type} attempt")
+        return None
+
+    logger.info(f"✅ Successfully generated answer using {attempt_type} approach")
+    return {
+        "answer": answer_text,
+        "source_documents": context_docs,
+        "similarity_scores": similarity_scores,
+        "search_method": attempt_type
+    }
+
+
+def _tier_attempt_type(tier_name: str) -> str:
+    return tier_name.lower().replace(" ", "_").replace("📄", "").replace("🌐", "").replace("🎬", "").strip()
+
+
+def cascade_attempts(query: str, retrieval: RetrievalResult) -> List[Dict]:
+    """
+    Local LLM attempts in cascade order: each tier above the standard
+    threshold (Phase 1), then the combined relaxed (Phase 2) and emergency
+    (Phase 3) sets. Each attempt has "phase", "tier", "attempt_type",
+    "threshold", "docs" and "scores". The answerability gate is checked
+    only when an attempt is reached (_passes_gate), so attempts after the
+    one that answers never pay for it.
+    """
+    attempts = []
+    for tier_name, _ in TIERS:
+        docs, scores = retrieval.tier_candidates(tier_name, SearchConfig.DEFAULT_THRESHOLD)
+        if docs:
+            attempts.append({"phase": "standard", "tier": tier_name, "attempt_type": _tier_attempt_type(tier_name),
+                             "threshold": SearchConfig.DEFAULT_THRESHOLD, "docs": docs, "scores": scores})
         else:
             logger.info(f"❌ No relevant documents found in {tier_name}")
-            
-    except Exception as e:
-        logger.error(f"Error searching {tier_name}: {e}")
-        
-    return None
+
+    for phase, threshold, attempt_type, tier in COMBINED_PHASES:
+        docs, scores = retrieval.combined_candidates(threshold)
+        if docs:
+            attempts.append({"phase": phase, "tier": tier, "attempt_type": attempt_type,
+                             "threshold": threshold, "docs": docs, "scores": scores})
+    return attempts
+
+
+def _passes_gate(query: str, attempt: Dict) -> bool:
+    """Answerability gate for one attempt; the verdict is kept on the attempt."""
+    if "answerable" not in attempt:
+        answerable, signals = answerability_gate.assess(query, attempt["docs"], attempt["scores"], attempt["threshold"], attempt["attempt_type"])
+        if not answerable:
+            details = f"top score {signals['top_score']:.3f}, term coverage {signals['coverage']:.0%}"
+            if signals["cross_encoder"] is not None:
+                details += f", cross-encoder {signals['cross_encoder']:.3f}"
+            logger.info(f"🚧 Skipping {attempt['tier']}: context unlikely to answer ({details})")
+        attempt["answerable"] = answerable
+    return attempt["answerable"]
+
+
+def _log_attempt(attempt: Dict) -> None:
+    icon = {"standard": "🔍", "relaxed": "🔄", "emergency": "🆘"}.get(attempt["phase"], "🔍")
+    logger.info(f"{icon} Attempting answer from {attempt['tier']} with top {len(attempt['docs'])} results (scores: {attempt['scores']})")
+
+
+def _is_cacheable(result: Dict) -> bool:
+    return result.get("search_method") not in SearchConfig.UNCACHEABLE_METHODS and bool(result.get("source_documents"))
+
+
+def _store_answer(query: str, query_embedding: np.ndarray, result: Dict, index_version: Optional[str]) -> None:
+    if index_version is not None and _is_cacheable(result):
+        answer_cache.store(query, query_embedding, result, index_version)
+
+
+def _cached_answer(query_embedding: np.ndarray) -> Tuple[Optional[Dict], Optional[str]]:
+    """Looks the query up in the answer cache; returns (cached answer or None, index version or None if disabled)."""
+    if not SearchConfig.ANSWER_CACHE_ENABLED:
+        return None, None
+    index_version = index_registry.version(active_index_paths())
+    cached = answer_cache.lookup(query_embedding, index_version)
+    if cached:
+        logger.info(f"⚡ Answer cache hit (similarity {cached['cache']['similarity']:.3f} to '{cached['cache']['cached_query'][:60]}')")
+    return cached, index_version
+
+
+def retrieve(query: str, limit: int = SearchConfig.MAX_TOTAL_DOCS, threshold: float = SearchConfig.EMERGENCY_THRESHOLD) -> Dict:
+    """
+    Retrieval only: the top-ranked chunks across all tiers, without calling the LLM.
+
+    Returns a dict with "source_documents", "similarity_scores", "tiers" (tier
+    of each document), "tier_timings" and "retrieval_seconds". "retrieval"
+    holds the RetrievalResult, which get_answer_stream accepts so the query
+    is not embedded and searched twice.
+    """
+    start = time.perf_counter()
+    retrieval = retrieve_candidates(embed_query(query))
+    selected = [c for c in retrieval.candidates if c["score"] > threshold][:limit]
+    return {
+        "source_documents": [c["document"] for c in selected],
+        "similarity_scores": [c["score"] for c in selected],
+        "tiers": [c["tier"] for c in selected],
+        "tier_timings": retrieval.tier_timings,
+        "retrieval_seconds": time.perf_counter() - start,
+        "search_method": "retrieval_only",
+        "retrieval": retrieval
+    }
 
 
 def get_answer(query: str) -> Dict:
     """Enhanced tiered search returning only top 5 most relevant documents."""
+    _count_query()
+    return answer_flights.do(("answer", normalize_query(query)), _get_answer, query)
+
+
+def _get_answer(query: str) -> Dict:
     logger.info(f"🔍 Processing query: '{query[:100]}{'...' if len(query) > 100 else ''}'")
     
-    # Define search tiers with proper paths
-    tiers = [
-        ("📄 Local Documents", DOC_FAISS_PATH),
-        ("🌐 Scraped Websites", SCRAPED_FAISS_PATH),
-        ("🎬 YouTube Videos", YOUTUBE_FAISS_PATH)
-    ]
+    # Embed the query once; the answer cache and every phase reuse this vector
+    query_embedding = embed_query(query)
+    
+    cached, index_version = _cached_answer(query_embedding)
+    if cached:
+        return cached
     
-    # Phase 1: Try each tier with standard threshold
-    for tier_name, index_path in tiers:
-        result = search_tier(tier_name, index_path, query, SearchConfig.DEFAULT_THRESHOLD)
+    result = answer_with_cascade(query, query_embedding)
+    _store_answer(query, query_embedding, result, index_version)
+    return result
+
+
+def prefetch_web_search(query: str, retrieval: RetrievalResult) -> Optional[TavilyPrefetch]:
+    """
+    Starts the Phase 4 web search in the background when the best local
+    score is below SearchConfig.DEFAULT_THRESHOLD + WEB_PREFETCH_MARGIN, so
+    the local phases and Tavily overlap. Returns None if not prefetching.
+    """
+    if not SearchConfig.WEB_PREFETCH:
+        return None
+    top_score = max((c["score"] for c in retrieval.candidates), default=0.0)
+    if top_score >= SearchConfig.DEFAULT_THRESHOLD + SearchConfig.WEB_PREFETCH_MARGIN:
+        return None
+    logger.info(f"🛰️ Top local score {top_score:.3f} is weak, prefetching web results")
+    return web_prefetcher.start(query)
+
+
+def answer_with_cascade(query: str, query_embedding: np.ndarray) -> Dict:
+    """Runs the full tiered cascade (Phases 1-4) for an already-embedded query."""
+    # Search each index once; every phase below filters this cached
+    # candidate list instead of searching again
+    retrieval = retrieve_candidates(query_embedding)
+    prefetch = prefetch_web_search(query, retrieval)
+    
+    # Phase 1: each tier with the standard threshold; Phases 2-3: relaxed and
+    # emergency thresholds across all tiers, still limited to top 5
+    attempts = cascade_attempts(query, retrieval)
+    if SearchConfig.SPECULATIVE_LLM:
+        result = speculative_attempts(query, attempts)
+    else:
+        result = sequential_attempts(query, attempts)
+    if result:
+        if prefetch:
+            prefetch.cancel()
+        return result
+    return web_fallback_answer(query, prefetch)
+
+
+def sequential_attempts(query: str, attempts: List[Dict]) -> Optional[Dict]:
+    """Tries cascade attempts one at a time; returns the first answer or None."""
+    for attempt in attempts:
+        if not _passes_gate(query, attempt):
+            continue
+        _log_attempt(attempt)
+        result = ask_llm(query, attempt["docs"], attempt["scores"], attempt["attempt_type"])
         if result:
+            logger.info(f"✅ Found answer in {attempt['tier']}")
+            result["tier"] = attempt["tier"]
             return result
+        logger.info(f"❌ {attempt['tier']} had {len(attempt['docs'])} relevant docs but LLM couldn't generate answer")
+    return None
+
+
+def _submit_attempt(query: str, attempt: Dict) -> Tuple[Future, threading.Event]:
+    """Starts ask_llm for a cascade attempt on the LLM pool; set the event to cancel it."""
+    cancel = threading.Event()
+    future = _llm_executor.submit(ask_llm, query, attempt["docs"], attempt["scores"], attempt["attempt_type"], cancel)
+    return future, cancel
+
+
+def _cancel_attempts(running: Dict[int, Tuple[Future, threading.Event]]) -> None:
+    """Drops queued attempts and closes the streams of running ones."""
+    for future, cancel in running.values():
+        future.cancel()
+        cancel.set()
+
+
+def speculative_attempts(query: str, attempts: List[Dict], fanout: int = SearchConfig.LLM_FANOUT) -> Optional[Dict]:
+    """
+    Runs cascade attempts concurrently, at most `fanout` at a time for this
+    query, and returns the highest-priority (earliest) result that passes
+    is_answer_failure, or None. Once a winner is known, queued calls are
+    dropped and running ones are cancelled, closing their streams.
+    """
+    running = {}
+    submitted = 0
+    logger.info(f"🚀 Speculative cascade: {len(attempts)} attempts, fan-out {fanout}")
+    try:
+        for i, attempt in enumerate(attempts):
+            # Keep the next `fanout` attempts in flight, in priority order
+            while submitted < len(attempts) and submitted < i + fanout:
+                if _passes_gate(query, attempts[submitted]):
+                    running[submitted] = _submit_attempt(query, attempts[submitted])
+                submitted += 1
+            if i not in running:
+                continue
+            future, _ = running.pop(i)
+            result = future.result()
+            if result:
+                logger.info(f"✅ Found answer in {attempt['tier']} (speculative, {len(running)} other calls cancelled)")
+                result["tier"] = attempt["tier"]
+                return result
+            logger.info(f"❌ {attempt['tier']} had {len(attempt['docs'])} relevant docs but LLM couldn't generate answer")
+        return None
+    finally:
+        _cancel_attempts(running)
+
+
+async def aspeculative_attempts(query: str, attempts: List[Dict], llm_timeout: Callable[[], float],
+                                fanout: int = SearchConfig.LLM_FANOUT) -> Optional[Dict]:
+    """
+    Async speculative_attempts: each call is a task bounded by llm_timeout()
+    at the time it starts, and every unfinished task is cancelled (closing
+    its HTTP request) once a winner is known or the budget is spent.
+    """
+    tasks = {}
+    submitted = 0
+    logger.info(f"🚀 Speculative cascade (async): {len(attempts)} attempts, fan-out {fanout}")
+    try:
+        for i, attempt in enumerate(attempts):
+            while submitted < len(attempts) and submitted < i + fanout:
+                timeout = llm_timeout()
+                if timeout <= 0:
+                    break
+                pending = attempts[submitted]
+                if await asyncio.to_thread(_passes_gate, query, pending):
+                    tasks[submitted] = asyncio.create_task(asyncio.wait_for(
+                        aask_llm(query, pending["docs"], pending["scores"], pending["attempt_type"]), timeout))
+                submitted += 1
+            if i not in tasks:
+                if i < submitted:
+                    continue  # Rejected by the answerability gate
+                logger.warning(f"⏱️ Deadline reached before trying {attempt['tier']}")
+                return None
+            try:
+                result = await tasks.pop(i)
+            except asyncio.TimeoutError:
+                logger.warning(f"⏱️ LLM call for {attempt['tier']} timed out")
+                continue
+            if result:
+                logger.info(f"✅ Found answer in {attempt['tier']} (speculative, {len(tasks)} other calls cancelled)")
+                result["tier"] = attempt["tier"]
+                return result
+        return None
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+
+# Phase 4 outcomes that are not an LLM answer: search_method -> (tier, answer)
+WEB_OUTCOMES = {
+    "failed": ("No Results", "I couldn't find relevant information in my MeitY knowledge base or through web search. Please try rephrasing your question with more specific terms related to Ministry of Electronics and IT, digital initiatives, or technology policies."),
+    "web_raw": ("Web Search (Raw Results)", "I found some information online but couldn't synthesize a clear answer from the MeitY context. Please review the top sources provided below for more details, or try rephrasing your question."),
+    "web_empty": ("Web Search Failed", "Web search completed but didn't return usable content. Please try rephrasing your question or adding more specific terms related to MeitY or Indian technology policies."),
+    "web_error": ("Web Search Error", "An error occurred during web search: {error}. This might be due to network issues or API limitations. Please try again later, or contact support if the problem persists.")
+}
+
+
+def web_outcome(search_method: str, docs: Optional[List[Document]] = None, scores: Optional[List[float]] = None, error: str = "") -> Dict:
+    tier, answer = WEB_OUTCOMES[search_method]
+    return {
+        "answer": answer.format(error=error),
+        "source_documents": docs or [],
+        "similarity_scores": scores or [],
+        "tier": tier,
+        "search_method": search_method
+    }
+
+
+def web_results_to_documents(web_results) -> Tuple[List[Document], List[float]]:
+    """Converts Tavily results (dicts or plain strings) to the top 5 web Documents and scores."""
+    web_docs = []
+    web_scores = []
     
-    # Phase 2: Relaxed search across all tiers, but still limit to top 5
-    logger.info("🔄 Phase 2: Retrying with relaxed similarity threshold...")
-    all_docs_with_scores = []
+    if isinstance(web_results, list):
+        for i, res in enumerate(web_results[:5]):  # Limit to top 5 web results
+            if isinstance(res, dict):
+                content = res.get('content', res.get('snippet', ''))
+                url = res.get('url', f'Web Result {i+1}')
+                title = res.get('title', 'Web Search Result')
+                score = res.get('score', 0.5)  # Default score for web results
+                
+                if content:
+                    doc = Document(
+                        page_content=content,
+                        metadata={
+                            'source': url,
+                            'title': title,
+                            'type': 'web_search',
+                            'tier': 'Web Search'
+                        }
+                    )
+                    web_docs.append(doc)
+                    web_scores.append(score)
+            else:
+                # Handle string results or other formats
+                doc = Document(
+                    page_content=str(res),
+                    metadata={
+                        'source': f'Web Result {i+1}',
+                        'title': 'Web Search Result',
+                        'type': 'web_search',
+                        'tier': 'Web Search'
+                    }
+                )
+                web_docs.append(doc)
+                web_scores.append(0.5)  # Default score
+    return web_docs, web_scores
+
+
+def web_search_context(query: str, prefetch: Optional[TavilyPrefetch] = None) -> Tuple[List[Document], List[float], Optional[Dict]]:
+    """
+    Phase 4 retrieval: runs the web search (or collects the prefetched one)
+    and converts its results.
+
+    Returns:
+        (docs, scores, None) when there is web context for the LLM, otherwise
+        ([], [], outcome) with the final "failed" / "web_empty" / "web_error" response
+    """
+    logger.info("🌐 Phase 4: Falling back to Internet search...")
+    try:
+        return _web_context(prefetch.result() if prefetch else search_tavily(query))
+    except Exception as e:
+        logger.error(f"Web search failed with error: {e}")
+        return [], [], web_outcome("web_error", error=str(e))
+
+
+def _web_context(web_results) -> Tuple[List[Document], List[float], Optional[Dict]]:
+    if not web_results:
+        logger.warning("Web search returned no results")
+        return [], [], web_outcome("failed")
     
-    for tier_name, index_path in tiers:
-        try:
-            docs, scores = search_vectorstore(index_path, query, SearchConfig.RELAXED_THRESHOLD)
-            if docs:
-                logger.info(f"Found {len(docs)} additional docs in {tier_name} with relaxed threshold")
-                # Add tier information to metadata and combine with scores
-                for doc, score in zip(docs, scores):
-                    doc.metadata["tier"] = tier_name
-                    all_docs_with_scores.append((doc, score))
-        except Exception as e:
-            logger.error(f"Error in relaxed search for {tier_name}: {e}")
+    web_docs, web_scores = web_results_to_documents(web_results)
+    if not web_docs:
+        logger.warning("No valid content found in web search results")
+        return [], [], web_outcome("web_empty")
     
-    # Sort by similarity score (highest first) and take top 5
-    if all_docs_with_scores:
-        all_docs_with_scores.sort(key=lambda x: x[1], reverse=True)
-        top_docs_with_scores = all_docs_with_scores[:5]
-        
-        top_docs = [doc for doc, score in top_docs_with_scores]
-        top_scores = [score for doc, score in top_docs_with_scores]
-        
-        logger.info(f"🔄 Attempting answer with top 5 combined relaxed results (scores: {top_scores})")
-        result = ask_llm(query, top_docs, top_scores, "combined_relaxed")
+    logger.info(f"Found {len(web_docs)} web results, attempting to synthesize answer")
+    return web_docs, web_scores, None
+
+
+def web_cache_candidates(query_embedding: np.ndarray) -> Tuple[List[Document], List[float]]:
+    """Top fresh results of the web cache index scoring above SearchConfig.WEB_CACHE_THRESHOLD."""
+    if not SearchConfig.WEB_CACHE_INDEX or not os.path.exists(os.path.join(index_dir(WEB_CACHE_FAISS_PATH), "index.faiss")):
+        return [], []
+    results = [(doc, score) for doc, score in search_scored(WEB_CACHE_FAISS_PATH, query_embedding)
+               if score > SearchConfig.WEB_CACHE_THRESHOLD and is_fresh(doc)][:5]
+    if results:
+        logger.info(f"🗄️ Phase 4: {len(results)} cached web results match (top score {results[0][1]:.3f})")
+    return [doc for doc, _ in results], [score for _, score in results]
+
+
+def remember_web_results(query: str, web_docs: List[Document]) -> None:
+    """Adds fresh web results to the web cache index in the background."""
+    if SearchConfig.WEB_CACHE_INDEX and web_docs:
+        web_cache_index.add_async(query, web_docs)
+
+
+def web_fallback_answer(query: str, prefetch: Optional[TavilyPrefetch] = None) -> Dict:
+    """Phase 4: answers from cached or live web search results, or explains why it could not."""
+    cached_docs, cached_scores = web_cache_candidates(embed_query(query))
+    if cached_docs:
+        result = ask_llm(query, cached_docs, cached_scores, "web_cache")
         if result:
-            result["tier"] = "Combined Sources (Relaxed)"
+            if prefetch:
+                prefetch.cancel()
+            result["tier"] = WEB_CACHE_TIER
             return result
     
-    # Phase 3: Emergency threshold search - still top 5
-    logger.info("🆘 Phase 3: Emergency threshold search...")
-    emergency_docs_with_scores = []
+    web_docs, web_scores, outcome = web_search_context(query, prefetch)
+    if outcome:
+        return outcome
+    remember_web_results(query, web_docs)
     
-    for tier_name, index_path in tiers:
+    result = ask_llm(query, web_docs, web_scores, "web_fallback")
+    if result:
+        result["tier"] = "Web Search"
+        return result
+    # LLM couldn't synthesize, but we have sources
+    return web_outcome("web_raw", web_docs, web_scores)
+
+
+def _sources_event(response: Dict) -> Dict:
+    return {
+        "type": "sources",
+        "source_documents": response.get("source_documents", []),
+        "similarity_scores": response.get("similarity_scores", []),
+        "tier": response.get("tier"),
+        "search_method": response.get("search_method")
+    }
+
+
+def _emit_response(response: Dict) -> Generator[Dict, None, None]:
+    """Emits a finished (cached or non-LLM) response as stream events."""
+    yield _sources_event(response)
+    yield {"type": "token", "content": response.get("answer", "")}
+    yield {"type": "final", "response": response}
+
+
+def _stream_attempt(query: str, context_docs: List[Document], similarity_scores: List[float],
+                    attempt_type: str, tier: str) -> Generator[Dict, None, Optional[Dict]]:
+    """
+    Streaming counterpart of ask_llm for one cascade attempt.
+
+    Yields the attempt's sources, then answer tokens. The stream is aborted
+    as soon as a failure phrase appears. The first
+    SearchConfig.STREAM_HOLDBACK_CHARS characters are held back, so a
+    refusal is normally aborted before anything is shown. If text was
+    already shown when the stream is aborted, or the finished answer still
+    fails is_answer_failure, a "retract" event tells the caller to discard
+    the tokens it rendered. Returns the result dict, or None on failure.
+    """
+    context_docs = context_docs[:5]
+    similarity_scores = similarity_scores[:5]
+    result = {
+        "answer": "",
+        "source_documents": context_docs,
+        "similarity_scores": similarity_scores,
+        "tier": tier,
+        "search_method": attempt_type
+    }
+    params = llm_params(query, context_docs, similarity_scores, attempt_type)
+    cache_key = llm_cache_key(query, context_docs, attempt_type, params)
+    cached = cached_llm_response(cache_key, attempt_type)
+    if cached is not None:
+        answer_text = (cached["answer"] or "").strip()
+        if cached["answer"] is None or is_answer_failure(answer_text):
+            return None
+        yield _sources_event(result)
+        yield {"type": "token", "content": answer_text}
+        result["answer"] = answer_text
+        return result
+
+    prompt = build_llm_prompt(query, context_docs, similarity_scores, attempt_type)
+    yield _sources_event(result)
+
+    logger.info(f"Streaming LLM answer ({params['model']}) with top {len(context_docs)} documents for {attempt_type}")
+    text = ""
+    emitted = 0
+    matcher = FailurePhraseMatcher()
+    stream = stream_llm(prompt, **params)
+    try:
+        for chunk in stream:
+            if matcher.feed(chunk):
+                logger.info(f"✂️ Aborted {attempt_type} stream after {len(matcher.text)} chars: '{matcher.match}'")
+                store_llm_response(cache_key, None)
+                if emitted:
+                    yield {"type": "retract"}
+                return None
+            text = matcher.text.lstrip()
+            if not emitted and len(text) < SearchConfig.STREAM_HOLDBACK_CHARS:
+                continue
+            yield {"type": "token", "content": text[emitted:]}
+            emitted = len(text)
+    except Exception as e:
+        logger.error(f"Error streaming LLM answer for {attempt_type}: {e}")
+        if emitted:
+            yield {"type": "retract"}
+        return None
+    finally:
+        stream.close()
+
+    store_llm_response(cache_key, matcher.text)
+    answer_text = text.strip()
+    if is_answer_failure(answer_text):
+        logger.info(f"LLM indicated insufficient context for {attempt_type} attempt")
+        if emitted:
+            yield {"type": "retract"}
+        return None
+    if not emitted:
+        yield {"type": "token", "content": answer_text}
+
+    logger.info(f"✅ Successfully streamed answer using {attempt_type} approach")
+    result["answer"] = answer_text
+    return result
+
+
+def get_answer_stream(query: str, retrieval: Optional[RetrievalResult] = None) -> Generator[Dict, None, None]:
+    """
+    Streaming version of get_answer: same cascade, but yields events as
+    soon as they are available instead of one finished dict. Pass the
+    "retrieval" of an earlier retrieve() call to reuse its search results.
+    Callers streaming the same question at the same time share one run and
+    each receive all of its events.
+
+    Events:
+        {"type": "sources", "source_documents", "similarity_scores", "tier", "search_method"}
+            - context of the attempt being answered; a later event replaces it
+        {"type": "token", "content"} - next piece of answer text
+        {"type": "retract"} - discard the answer text shown so far
+        {"type": "final", "response"} - the complete get_answer-style dict
+    """
+    _count_query()
+    yield from answer_flights.stream(("stream", normalize_query(query)), _get_answer_stream, query, retrieval)
+
+
+def _get_answer_stream(query: str, retrieval: Optional[RetrievalResult] = None) -> Generator[Dict, None, None]:
+    logger.info(f"🔍 Streaming query: '{query[:100]}{'...' if len(query) > 100 else ''}'")
+    query_embedding = retrieval.query_embedding if retrieval is not None else embed_query(query)
+
+    cached, index_version = _cached_answer(query_embedding)
+    if cached:
+        yield from _emit_response(cached)
+        return
+
+    if retrieval is None:
+        retrieval = retrieve_candidates(query_embedding)
+    prefetch = prefetch_web_search(query, retrieval)
+    attempts = cascade_attempts(query, retrieval)
+    running = {}
+    try:
+        for i, attempt in enumerate(attempts):
+            if SearchConfig.SPECULATIVE_LLM:
+                # Answer the next attempts in the background while this one streams
+                for j in range(i + 1, min(len(attempts), i + SearchConfig.LLM_FANOUT)):
+                    if j not in running and _passes_gate(query, attempts[j]):
+                        running[j] = _submit_attempt(query, attempts[j])
+            if i not in running and not _passes_gate(query, attempt):
+                continue
+            _log_attempt(attempt)
+            if i in running:
+                future, _ = running.pop(i)
+                result = future.result()
+                if result:
+                    result["tier"] = attempt["tier"]
+                    yield _sources_event(result)
+                    yield {"type": "token", "content": result["answer"]}
+            else:
+                result = yield from _stream_attempt(query, attempt["docs"], attempt["scores"], attempt["attempt_type"], attempt["tier"])
+            if result:
+                if prefetch:
+                    prefetch.cancel()
+                _store_answer(query, query_embedding, result, index_version)
+                yield {"type": "final", "response": result}
+                return
+    finally:
+        _cancel_attempts(running)
+
+    cached_docs, cached_scores = web_cache_candidates(query_embedding)
+    if cached_docs:
+        result = yield from _stream_attempt(query, cached_docs, cached_scores, "web_cache", WEB_CACHE_TIER)
+        if result:
+            if prefetch:
+                prefetch.cancel()
+            _store_answer(query, query_embedding, result, index_version)
+            yield {"type": "final", "response": result}
+            return
+
+    web_docs, web_scores, outcome = web_search_context(query, prefetch)
+    if outcome:
+        yield from _emit_response(outcome)
+        return
+    remember_web_results(query, web_docs)
+
+    result = yield from _stream_attempt(query, web_docs, web_scores, "web_fallback", "Web Search")
+    if result:
+        _store_answer(query, query_embedding, result, index_version)
+        yield {"type": "final", "response": result}
+    else:
+        yield from _emit_response(web_outcome("web_raw", web_docs, web_scores))
+
+
+def deadline_outcome(docs: List[Document], scores: List[float]) -> Dict:
+    """Response returned when aget_answer runs out of time before any LLM answer."""
+    return {
+        "answer": "I couldn't complete an answer within the time limit. The most relevant sources found so far are listed below - please review them or try again in a moment.",
+        "source_documents": docs,
+        "similarity_scores": scores,
+        "tier": "Time Limit Reached",
+        "search_method": "deadline_exceeded"
+    }
+
+
+async def aget_answer(query: str, deadline_seconds: float = SearchConfig.ANSWER_DEADLINE_SECONDS) -> Dict:
+    """
+    Async version of get_answer with an end-to-end deadline.
+
+    Runs the same cascade, but LLM calls are streamed with astream (through
+    aask_llm / agenerate_answer) and the web search uses asearch_tavily, so
+    many sessions can share one event loop. Each phase
+    gets at most SearchConfig.PHASE_TIMEOUTS[phase] seconds and never more
+    than what is left of `deadline_seconds`. When the budget runs out the
+    best response found so far is returned: raw web results if the web
+    search finished, otherwise the top local sources (deadline_outcome).
+    Embedding and FAISS search run in a worker thread.
+    """
+    _count_query()
+    logger.info(f"🔍 Processing query (async, {deadline_seconds:.0f}s budget): '{query[:100]}{'...' if len(query) > 100 else ''}'")
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_seconds
+
+    def budget(phase: str) -> float:
+        return min(SearchConfig.PHASE_TIMEOUTS[phase], deadline - loop.time())
+
+    best = deadline_outcome([], [])
+    try:
+        query_embedding = await asyncio.wait_for(asyncio.to_thread(embed_query, query), budget("retrieval"))
+        cached, index_version = _cached_answer(query_embedding)
+        if cached:
+            return cached
+        retrieval = await asyncio.wait_for(asyncio.to_thread(retrieve_candidates, query_embedding), budget("retrieval"))
+    except asyncio.TimeoutError:
+        logger.warning("⏱️ Retrieval did not finish within its time budget")
+        return best
+
+    best = deadline_outcome(*retrieval.combined_candidates(SearchConfig.EMERGENCY_THRESHOLD))
+
+    attempts = cascade_attempts(query, retrieval)
+    if SearchConfig.SPECULATIVE_LLM:
+        result = await aspeculative_attempts(query, attempts, lambda: budget("llm"))
+        if result:
+            _store_answer(query, query_embedding, result, index_version)
+            return result
+        attempts = []  # Every local attempt has already been tried
+
+    for attempt in attempts:
+        timeout = budget("llm")
+        if timeout <= 0:
+            logger.warning(f"⏱️ Deadline reached before trying {attempt['tier']}")
+            return best
+        if not await asyncio.to_thread(_passes_gate, query, attempt):
+            continue
+        _log_attempt(attempt)
         try:
-            docs, scores = search_vectorstore(index_path, query, SearchConfig.EMERGENCY_THRESHOLD)
-            if docs:
-                logger.info(f"Found {len(docs)} docs in {tier_name} with emergency threshold")
-                for doc, score in zip(docs, scores):
-                    doc.metadata["tier"] = tier_name
-                    emergency_docs_with_scores.append((doc, score))
-        except Exception as e:
-            logger.error(f"Error in emergency search for {tier_name}: {e}")
-    
-    # Sort by similarity score and take top 5
-    if emergency_docs_with_scores:
-        emergency_docs_with_scores.sort(key=lambda x: x[1], reverse=True)
-        top_emergency_docs = emergency_docs_with_scores[:5]
-        
-        emergency_docs = [doc for doc, score in top_emergency_docs]
-        emergency_scores = [score for doc, score in top_emergency_docs]
-        
-        logger.info(f"🆘 Attempting answer with top 5 emergency results (scores: {emergency_scores})")
-        result = ask_llm(query, emergency_docs, emergency_scores, "emergency_combined")
+            result = await asyncio.wait_for(aask_llm(query, attempt["docs"], attempt["scores"], attempt["attempt_type"]), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⏱️ LLM call for {attempt['tier']} timed out after {timeout:.1f}s")
+            continue
         if result:
-            result["tier"] = "Emergency Search (Very Relaxed)"
+            logger.info(f"✅ Found answer in {attempt['tier']}")
+            result["tier"] = attempt["tier"]
+            _store_answer(query, query_embedding, result, index_version)
             return result
-    
-    # Phase 4: Web search fallback - limit to top 5
+
+    cached_docs, cached_scores = await asyncio.to_thread(web_cache_candidates, query_embedding)
+    timeout = budget("llm")
+    if cached_docs and timeout > 0:
+        try:
+            result = await asyncio.wait_for(aask_llm(query, cached_docs, cached_scores, "web_cache"), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⏱️ LLM call for {WEB_CACHE_TIER} timed out after {timeout:.1f}s")
+            result = None
+        if result:
+            result["tier"] = WEB_CACHE_TIER
+            _store_answer(query, query_embedding, result, index_version)
+            return result
+
+    timeout = budget("web_search")
+    if timeout <= 0:
+        logger.warning("⏱️ Deadline reached before web search")
+        return best
     logger.info("🌐 Phase 4: Falling back to Internet search...")
     try:
-        web_results = search_tavily(query)
-        
-        if not web_results:
-            logger.warning("Web search returned no results")
-            return {
-                "answer": "I couldn't find relevant information in my MeitY knowledge base or through web search. Please try rephrasing your question with more specific terms related to Ministry of Electronics and IT, digital initiatives, or technology policies.",
-                "source_documents": [],
-                "similarity_scores": [],
-                "tier": "No Results",
-                "search_method": "failed"
-            }
-        
-        # Handle different possible return formats from Tavily and limit to top 5
-        web_docs = []
-        web_scores = []
-        
-        if isinstance(web_results, list):
-            for i, res in enumerate(web_results[:5]):  # Limit to top 5 web results
-                if isinstance(res, dict):
-                    content = res.get('content', res.get('snippet', ''))
-                    url = res.get('url', f'Web Result {i+1}')
-                    title = res.get('title', 'Web Search Result')
-                    score = res.get('score', 0.5)  # Default score for web results
-                    
-                    if content:
-                        doc = Document(
-                            page_content=content,
-                            metadata={
-                                'source': url,
-                                'title': title,
-                                'type': 'web_search',
-                                'tier': 'Web Search'
-                            }
-                        )
-                        web_docs.append(doc)
-                        web_scores.append(score)
-                else:
-                    # Handle string results or other formats
-                    doc = Document(
-                        page_content=str(res),
-                        metadata={
-                            'source': f'Web Result {i+1}',
-                            'title': 'Web Search Result',
-                            'type': 'web_search',
-                            'tier': 'Web Search'
-                        }
-                    )
-                    web_docs.append(doc)
-                    web_scores.append(0.5)  # Default score
-        
-        if web_docs:
-            logger.info(f"Found {len(web_docs)} web results, attempting to synthesize answer")
-            result = ask_llm(query, web_docs, web_scores, "web_fallback")
-            
-            if result:
-                result["tier"] = "Web Search"
-                return result
-            else:
-                # LLM couldn't synthesize, but we have sources
-                return {
-                    "answer": "I found some information online but couldn't synthesize a clear answer from the MeitY context. Please review the top sources provided below for more details, or try rephrasing your question.",
-                    "source_documents": web_docs,
-                    "similarity_scores": web_scores,
-                    "tier": "Web Search (Raw Results)",
-                    "search_method": "web_raw"
-                }
-        else:
-            logger.warning("No valid content found in web search results")
-            return {
-                "answer": "Web search completed but didn't return usable content. Please try rephrasing your question or adding more specific terms related to MeitY or Indian technology policies.",
-                "source_documents": [],
-                "similarity_scores": [],
-                "tier": "Web Search Failed",
-                "search_method": "web_empty"
-            }
-        
+        web_docs, web_scores, outcome = _web_context(await asyncio.wait_for(asearch_tavily(query), timeout))
+    except asyncio.TimeoutError:
+        logger.warning(f"⏱️ Web search timed out after {timeout:.1f}s")
+        return best
     except Exception as e:
         logger.error(f"Web search failed with error: {e}")
-        return {
-            "answer": f"An error occurred during web search: {str(e)}. This might be due to network issues or API limitations. Please try again later, or contact support if the problem persists.",
-            "source_documents": [],
-            "similarity_scores": [],
-            "tier": "Web Search Error",
-            "search_method": "web_error"
-        }
+        return web_outcome("web_error", error=str(e))
+    if outcome:
+        return outcome
+    remember_web_results(query, web_docs)
+
+    best = web_outcome("web_raw", web_docs, web_scores)
+    timeout = budget("llm")
+    if timeout <= 0:
+        return best
+    try:
+        result = await asyncio.wait_for(aask_llm(query, web_docs, web_scores, "web_fallback"), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"⏱️ LLM call for Web Search timed out after {timeout:.1f}s")
+        return best
+    if result:
+        result["tier"] = "Web Search"
+        _store_answer(query, query_embedding, result, index_version)
+        return result
+    return best
+
+
+# --- Pipeline Stats ---
+_query_count = 0
+_query_count_lock = threading.Lock()
+
+
+def pipeline_stats() -> Dict[str, Dict]:
+    """Counters of every cache, gate and LLM optimization in this process, by component."""
+    return {
+        "answer_cache": answer_cache.stats(),
+        "llm_cache": llm_response_cache.stats(),
+        "sentence_cache": sentence_embedding_cache.stats(),
+        "tavily_cache": tavily_cache.stats(),
+        "coalescing": answer_flights.stats(),
+        "answerability_gate": answerability_gate.stats(),
+        "routing": query_router.stats(),
+        "web_prefetch": web_prefetcher.stats(),
+        "web_cache_index": web_cache_index.stats(),
+        "llm_client": llm_client.stats(),
+        "indexes": index_registry.stats()
+    }
+
+
+def stats_summary() -> str:
+    """One-line digest of pipeline_stats() for the logs."""
+    stats = pipeline_stats()
+    prefetch = stats["web_prefetch"]
+    summary = (f"answer cache {stats['answer_cache']['hit_rate']:.0%} hits, "
+               f"LLM cache {stats['llm_cache']['hit_rate']:.0%} hits, "
+               f"coalesced {stats['coalescing']['coalescing_rate']:.0%}, "
+               f"gate avoided {stats['answerability_gate']['llm_calls_avoided']} LLM calls, "
+               f"prefetch used {prefetch['used']}/{prefetch['started']} ({prefetch['seconds_saved']:.1f}s saved), "
+               f"fast route {stats['routing']['fast_rate']:.0%}")
+    if "hedging" in stats["llm_client"]:
+        summary += f", hedged {stats['llm_client']['hedging']['hedge_rate']:.0%}"
+    return summary
+
+
+def _count_query() -> None:
+    """Counts a question and logs stats_summary() every SearchConfig.STATS_LOG_EVERY questions."""
+    global _query_count
+    with _query_count_lock:
+        _query_count += 1
+        count = _query_count
+    if SearchConfig.STATS_LOG_EVERY and count % SearchConfig.STATS_LOG_EVERY == 0:
+        logger.info(f"📊 Pipeline stats after {count} queries: {stats_summary()}")
 
 
 # Export the main function for external use
-__all__ = ['get_answer']
\ No newline at end of file
+__all__ = ['get_answer', 'get_answer_stream', 'retrieve', 'aget_answer', 'pipeline_stats']
@@ -0,0 +1,102 @@
+import re
+import logging
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from langchain.docstore.document import Document
+
+from backend.answerability import content_terms
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class RouterConfig:
+    MAX_SIMPLE_TERMS = 6  # Content terms in a simple lookup ("What is MeitY?" has 1)
+    MAX_SIMPLE_ENTITIES = 2  # Acronyms, proper names and numbers in a simple lookup
+    MIN_SIMPLE_TOP_SCORE = 0.7  # The best chunk must match this well for the fast model to answer from it
+    MIN_SIMPLE_SPREAD = 0.03  # Top score minus the lowest context score; flat scores mean the answer is spread out
+    COMPLEX_MARKERS = {
+        "compare", "comparison", "difference", "differences", "differ", "versus", "vs", "contrast",
+        "relationship", "advantages", "disadvantages", "pros", "cons", "evaluate", "analyse", "analyze",
+        "explain", "describe", "impact", "implications", "amendments", "steps", "process"
+    }
+
+
+FAST_ROUTE = "fast"
+FULL_ROUTE = "full"
+
+_WORD_RE = re.compile(r"\w+")
+# Acronyms (MeitY, IT, DPDP), capitalized words after the first word, and numbers (years, sections)
+_ENTITY_RE = re.compile(r"\b(?:[A-Z][a-z]*[A-Z]\w*|[A-Z]{2,}\w*|\d[\d.,]*)\b")
+_CAPITALIZED_RE = re.compile(r"(?<!^)(?<![.?!]\s)\b[A-Z][a-z]+\b")
+
+
+def count_entities(query: str) -> int:
+    """Distinct acronyms, proper names and numbers in the query."""
+    query = query.strip()
+    return len(set(_ENTITY_RE.findall(query)) | set(_CAPITALIZED_RE.findall(query)))
+
+
+class QueryRouter:
+    """
+    Picks the LLM route for a cascade attempt from cheap local features.
+
+    A query goes to FAST_ROUTE only if it looks like a simple lookup - few
+    content terms and entities, one question, no comparison/explanation
+    wording - and its context has a confident best chunk that stands out
+    from the rest. Everything else, and every query while routing is
+    disabled, goes to FULL_ROUTE. stats() reports how queries were routed.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.routed: Counter = Counter()
+
+    def features(self, query: str, docs: List[Document], scores: List[Optional[float]]) -> Dict[str, Any]:
+        """Query length, entities, complexity markers and the context score distribution."""
+        terms = content_terms(query)
+        # Markers are matched on every word: "explain" and "describe" are gate stopwords
+        words = set(_WORD_RE.findall(query.lower()))
+        known_scores = [score for score in scores if score is not None]
+        top_score = max(known_scores) if known_scores else 0.0
+        return {
+            "terms": len(terms),
+            "entities": count_entities(query),
+            "questions": max(1, query.count("?")),
+            "complex_markers": sorted(words & RouterConfig.COMPLEX_MARKERS),
+            "top_score": top_score,
+            "spread": top_score - min(known_scores) if known_scores else 0.0,
+            "context_docs": len(docs)
+        }
+
+    def route(self, query: str, docs: List[Document], scores: List[Optional[float]], attempt_type: str = "") -> str:
+        """Returns FAST_ROUTE or FULL_ROUTE for the attempt."""
+        if not self.enabled:
+            return FULL_ROUTE
+
+        features = self.features(query, docs, scores)
+        simple = (
+            features["terms"] <= RouterConfig.MAX_SIMPLE_TERMS
+            and features["entities"] <= RouterConfig.MAX_SIMPLE_ENTITIES
+            and features["questions"] == 1
+            and not features["complex_markers"]
+            and features["top_score"] >= RouterConfig.MIN_SIMPLE_TOP_SCORE
+            and (features["context_docs"] < 2 or features["spread"] >= RouterConfig.MIN_SIMPLE_SPREAD)
+        )
+        route = FAST_ROUTE if simple else FULL_ROUTE
+        logger.info(f"🧭 Routed {attempt_type or 'attempt'} to {route} model "
+                    f"(terms={features['terms']}, entities={features['entities']}, "
+                    f"top={features['top_score']:.3f}, spread={features['spread']:.3f})")
+        with self._lock:
+            self.routed[route] += 1
+        return route
+
+    def stats(self) -> Dict[str, Any]:
+        total = sum(self.routed.values())
+        return {
+            "routed": dict(self.routed),
+            "fast_rate": self.routed[FAST_ROUTE] / total if total else 0.0
+        }
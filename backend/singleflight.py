@@ -0,0 +1,134 @@
+import copy
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """Event log of one in-flight computation that any number of callers can follow."""
+
+    def __init__(self):
+        self.events: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+
+    def publish(self, event: Any) -> None:
+        with self._cond:
+            self.events.append(event)
+            self._cond.notify_all()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        with self._cond:
+            self.done = True
+            self.error = error
+            self._cond.notify_all()
+
+    def follow(self) -> Iterator[Any]:
+        """Yields every event from the first one, waiting for new ones until the flight finishes."""
+        i = 0
+        while True:
+            with self._cond:
+                while i >= len(self.events) and not self.done:
+                    self._cond.wait()
+                if i < len(self.events):
+                    event = self.events[i]
+                elif self.error is not None:
+                    raise self.error
+                else:
+                    return
+            i += 1
+            yield event
+
+
+def _shallow_copy(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return copy.copy(value)
+    return value
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one computation.
+
+    The first caller for a key runs it; callers arriving while it is still
+    in flight wait and receive the same result (do; dicts and lists come as
+    shallow copies, so a caller adding keys does not change what the others
+    see) or the same event stream from its start (stream). Nothing is kept
+    once the flight lands, so this only deduplicates overlapping calls -
+    caching finished results is the answer cache's job.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable):
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = _Flight()
+            self._flights[key] = flight
+            return flight, True
+
+    def _land(self, key: Hashable, flight: _Flight, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.finish(error)
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Returns fn(*args, **kwargs), shared with every concurrent caller using the same key."""
+        flight, leader = self._join(key)
+        if not leader:
+            logger.info(f"🔗 Joined in-flight request for {key!r}")
+            results = list(flight.follow())
+            return _shallow_copy(results[-1])
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._land(key, flight, e)
+            raise
+        flight.publish(result)
+        self._land(key, flight)
+        return result
+
+    def stream(self, key: Hashable, make_events: Callable[..., Iterator[Any]], *args, **kwargs) -> Iterator[Any]:
+        """
+        Yields the events of make_events(*args, **kwargs), shared with every
+        concurrent caller using the same key. The generator runs on its own
+        thread, so a caller that stops reading does not cut off the others.
+        """
+        flight, leader = self._join(key)
+        if leader:
+            def run():
+                try:
+                    for event in make_events(*args, **kwargs):
+                        flight.publish(event)
+                except BaseException as e:
+                    logger.error(f"In-flight stream for {key!r} failed: {e}")
+                    self._land(key, flight, e)
+                    return
+                self._land(key, flight)
+
+            threading.Thread(target=run, name="singleflight-stream", daemon=True).start()
+        else:
+            logger.info(f"🔗 Joined in-flight stream for {key!r}")
+        yield from flight.follow()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "coalescing_rate": self.coalesced / self.calls if self.calls else 0.0,
+            "in_flight": len(self._flights)
+        }
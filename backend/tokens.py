@@ -0,0 +1,42 @@
+import os
+import math
+import logging
+from functools import lru_cache
+from typing import List
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Tokenizer of the answering model; gated Hugging Face repos need HF_TOKEN to download
+TOKENIZER_NAME = os.environ.get("TOKENIZER_NAME", "mistralai/Mistral-7B-Instruct-v0.2")
+CHARS_PER_TOKEN = 4  # Estimate used when the tokenizer cannot be loaded
+
+
+@lru_cache(maxsize=1)
+def get_tokenizer():
+    """Loads the Hugging Face tokenizer once, or returns None to fall back to estimates."""
+    try:
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_NAME)
+        logger.info(f"Loaded tokenizer {TOKENIZER_NAME} for token counting")
+        return tokenizer
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer {TOKENIZER_NAME}, estimating tokens from length: {e}")
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def count_tokens_batch(texts: List[str]) -> List[int]:
+    """Token counts of several texts in one tokenizer call."""
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        return [estimate_tokens(text) for text in texts]
+    encoded = tokenizer(texts, add_special_tokens=False)["input_ids"]
+    return [len(ids) for ids in encoded]
+
+
+def count_tokens(text: str) -> int:
+    return count_tokens_batch([text])[0]
@@ -0,0 +1,216 @@
+import os
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers in one process are still serialized by the writer thread
+    fcntl = None
+
+import faiss
+from langchain_community.vectorstores import FAISS
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain.docstore.document import Document
+
+from backend.index_factory import CURRENT_VERSION_FILE
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class WebCacheConfig:
+    MAX_AGE_SECONDS = float(os.environ.get("WEB_CACHE_MAX_AGE_DAYS", "14")) * 24 * 3600  # Web results go stale
+    MAX_VECTORS = 20000  # Oldest results are dropped beyond this
+    MIN_CONTENT_CHARS = 100  # Shorter snippets are not worth keeping
+    LOCK_FILE = ".writer.lock"  # flock'ed by the process updating the index
+
+
+def content_hash(url: str, text: str) -> str:
+    """Dedupe key of a web result: its URL plus its whitespace-normalized text."""
+    return hashlib.sha1(f"{url}\n{' '.join(text.split())}".encode("utf-8")).hexdigest()
+
+
+def is_fresh(doc: Document, max_age_seconds: float = WebCacheConfig.MAX_AGE_SECONDS) -> bool:
+    return doc.metadata.get("fetched_at", 0) >= time.time() - max_age_seconds
+
+
+class WebCacheIndex:
+    """
+    FAISS index of web search results, grown in the background so repeat
+    out-of-corpus questions can be answered without going back to Tavily.
+
+    add_async() queues results on a single writer thread. Each update holds
+    a file lock shared by every process using the index, so it starts from
+    the latest saved version, clones it, drops expired entries (older than
+    `max_age_seconds`) and the oldest ones beyond `max_vectors`, appends the
+    new results that are not already stored (same URL and text), saves it as
+    a new version that CURRENT is then switched to (see _save), and hands the
+    new index to the registry so searches use it without reading it back.
+    Searching goes through the registry like any other index.
+    """
+
+    def __init__(self, index_path: str, embeddings: Any, registry: Any,
+                 max_age_seconds: float = WebCacheConfig.MAX_AGE_SECONDS,
+                 max_vectors: int = WebCacheConfig.MAX_VECTORS):
+        self.index_path = index_path
+        self.embeddings = embeddings
+        self.registry = registry
+        self.max_age_seconds = max_age_seconds
+        self.max_vectors = max_vectors
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="web-cache-index")
+        self._lock = threading.Lock()
+        self._counters = {"updates": 0, "added": 0, "duplicates": 0, "expired": 0, "evicted": 0, "errors": 0}
+        self.update_seconds = 0.0
+
+    def add_async(self, query: str, docs: List[Document]) -> Future:
+        """Queues web result Documents for the index; returns the future of add()."""
+        return self._executor.submit(self._add_logged, query, docs)
+
+    def _add_logged(self, query: str, docs: List[Document]) -> int:
+        try:
+            return self.add(query, docs)
+        except Exception as e:
+            logger.error(f"Could not add web results to the web cache index: {e}")
+            self._count("errors")
+            return 0
+
+    def _count(self, key: str, delta: int = 1) -> None:
+        with self._lock:
+            self._counters[key] += delta
+
+    def _new_docs(self, query: str, docs: List[Document], known: set) -> List[Document]:
+        new_docs = []
+        fetched_at = time.time()
+        for doc in docs:
+            url = doc.metadata.get("source", "")
+            text = doc.page_content.strip()
+            if not url.startswith("http") or len(text) < WebCacheConfig.MIN_CONTENT_CHARS:
+                continue
+            key = content_hash(url, text)
+            if key in known:
+                self._count("duplicates")
+                continue
+            known.add(key)
+            new_docs.append(Document(page_content=text, metadata={
+                "source": url,
+                "title": doc.metadata.get("title", "Web Search Result"),
+                "type": "web_cache",
+                "query": query,
+                "fetched_at": fetched_at,
+                "content_hash": key
+            }))
+        return new_docs
+
+    def add(self, query: str, docs: List[Document]) -> int:
+        """Embeds and stores the results not yet in the index; returns how many were added."""
+        with self._writer_lock():
+            return self._add(query, docs)
+
+    @contextmanager
+    def _writer_lock(self) -> Iterator[None]:
+        os.makedirs(self.index_path, exist_ok=True)
+        with open(os.path.join(self.index_path, WebCacheConfig.LOCK_FILE), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _add(self, query: str, docs: List[Document]) -> int:
+        start = time.perf_counter()
+        # Under the lock: the registry reloads the index if another process switched CURRENT
+        current = self.registry.get(self.index_path)
+
+        stored = []
+        if current is not None:
+            for doc_id in current.index_to_docstore_id.values():
+                doc = current.docstore.search(doc_id)
+                if isinstance(doc, Document):
+                    stored.append((doc_id, doc))
+        expired = [doc_id for doc_id, doc in stored if not is_fresh(doc, self.max_age_seconds)]
+        expired_ids = set(expired)
+        fresh = [(doc_id, doc) for doc_id, doc in stored if doc_id not in expired_ids]
+        known = {doc.metadata.get("content_hash") for _, doc in fresh}
+
+        new_docs = self._new_docs(query, docs, known)
+        if not new_docs and not expired:
+            return 0
+
+        # Oldest first beyond the size cap, counting what is about to be added
+        overflow = max(0, len(fresh) + len(new_docs) - self.max_vectors)
+        oldest = sorted(fresh, key=lambda item: item[1].metadata.get("fetched_at", 0))
+        evicted = [doc_id for doc_id, _ in oldest[:overflow]]
+
+        vectordb = self._clone(current) if current is not None else None
+        if vectordb is not None and expired + evicted:
+            vectordb.delete(expired + evicted)
+        if new_docs:
+            texts = [doc.page_content for doc in new_docs]
+            text_embeddings = list(zip(texts, self.embeddings.embed_documents(texts)))
+            metadatas = [doc.metadata for doc in new_docs]
+            if vectordb is None:
+                vectordb = FAISS.from_embeddings(text_embeddings, self.embeddings, metadatas=metadatas)
+            else:
+                vectordb.add_embeddings(text_embeddings, metadatas=metadatas)
+
+        self._save(vectordb)
+        self.registry.put(self.index_path, vectordb)
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._counters["updates"] += 1
+            self._counters["added"] += len(new_docs)
+            self._counters["expired"] += len(expired)
+            self._counters["evicted"] += len(evicted)
+            self.update_seconds += elapsed
+        logger.info(f"🗄️ Web cache index: +{len(new_docs)} results, -{len(expired)} expired, -{len(evicted)} evicted "
+                    f"({vectordb.index.ntotal} vectors, {elapsed:.2f}s)")
+        return len(new_docs)
+
+    @staticmethod
+    def _clone(vectordb: FAISS) -> FAISS:
+        """Copy of a loaded index that can be modified while searches keep using the original."""
+        doc_ids = list(vectordb.index_to_docstore_id.values())
+        return FAISS(
+            embedding_function=vectordb.embedding_function,
+            index=faiss.clone_index(vectordb.index),
+            docstore=InMemoryDocstore({doc_id: vectordb.docstore.search(doc_id) for doc_id in doc_ids}),
+            index_to_docstore_id=dict(vectordb.index_to_docstore_id)
+        )
+
+    def _save(self, vectordb: FAISS) -> None:
+        # Each save is a new version directory; renaming the CURRENT file over
+        # the old one switches index.faiss and index.pkl together, so other
+        # processes never load a new index file with an old docstore
+        version = f"v{time.time_ns()}"
+        vectordb.save_local(os.path.join(self.index_path, version))
+        marker_tmp = os.path.join(self.index_path, f"{CURRENT_VERSION_FILE}.tmp-{os.getpid()}")
+        with open(marker_tmp, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(marker_tmp, os.path.join(self.index_path, CURRENT_VERSION_FILE))
+        self._prune(version)
+
+    def _prune(self, current: str) -> None:
+        """Deletes the versions older than the one before `current`, which readers may still be opening."""
+        older = sorted(name for name in os.listdir(self.index_path)
+                       if name.startswith("v") and name < current and os.path.isdir(os.path.join(self.index_path, name)))
+        for name in older[:-1]:
+            shutil.rmtree(os.path.join(self.index_path, name), ignore_errors=True)
+        # Files of the unversioned layout, no longer read once CURRENT exists
+        for name in ("index.faiss", "index.pkl"):
+            if os.path.exists(os.path.join(self.index_path, name)):
+                os.remove(os.path.join(self.index_path, name))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["update_seconds"] = round(self.update_seconds, 3)
+        return stats
@@ -1,12 +1,51 @@
 import os
+import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from langchain_community.tools.tavily_search import TavilySearchResults
 
+from backend.cache import TTLCache, normalize_query
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
-def search_tavily(query: str, max_results: int = 5) -> List[Dict]:
+# --- Processed Tavily results are cached on disk, keyed by normalized query and max_results ---
+TAVILY_CACHE_ENABLED = os.environ.get("TAVILY_CACHE_ENABLED", "true").lower() == "true"
+TAVILY_CACHE_TTL_SECONDS = float(os.environ.get("TAVILY_CACHE_TTL_SECONDS", str(6 * 3600)))
+TAVILY_CACHE_MAX_ENTRIES = 500
+TAVILY_CACHE_PATH = os.path.join(os.environ.get("PERSISTENT_STORAGE_PATH", "persistent_storage"), "tavily_cache.pkl")
+
+tavily_cache = TTLCache(
+    ttl_seconds=TAVILY_CACHE_TTL_SECONDS,
+    max_entries=TAVILY_CACHE_MAX_ENTRIES,
+    persist_path=TAVILY_CACHE_PATH
+)
+
+
+def _cache_key(query: str, max_results: int) -> str:
+    return f"{normalize_query(query)}|{max_results}"
+
+
+def cached_tavily_results(query: str, max_results: int) -> Optional[List[Dict]]:
+    """Processed results of an earlier identical search that has not expired, or None."""
+    if not TAVILY_CACHE_ENABLED:
+        return None
+    results = tavily_cache.get(_cache_key(query, max_results))
+    if results is not None:
+        logger.info(f"💾 Tavily cache hit for: '{query}' ({len(results)} results)")
+        return [dict(result) for result in results]
+    return None
+
+
+def store_tavily_results(query: str, max_results: int, results: List[Dict]) -> None:
+    # Empty results are not cached: they are as likely a transient failure as a real miss
+    if TAVILY_CACHE_ENABLED and results:
+        tavily_cache.put(_cache_key(query, max_results), results)
+
+
+def search_tavily(query: str, max_results: int = 5, use_cache: bool = True) -> List[Dict]:
     """
     Performs a web search using the Tavily API with enhanced error handling
     and better result formatting.
@@ -14,6 +53,7 @@ def search_tavily(query: str, max_results: int = 5) -> List[Dict]:
     Args:
         query: Search query string
         max_results: Maximum number of results to return (default: 5)
+        use_cache: Serve and store results through the on-disk Tavily cache
     
     Returns:
         List of dictionaries containing search results with keys:
@@ -29,88 +69,139 @@ def search_tavily(query: str, max_results: int = 5) -> List[Dict]:
         logger.error("Tavily API key is not set in environment variables")
         return []
     
+    if use_cache:
+        cached = cached_tavily_results(query, max_results)
+        if cached is not None:
+            return cached
+    
     try:
         logger.info(f"Performing Tavily search for: '{query}' (max_results: {max_results})")
         
-        # Initialize Tavily search tool
-        tool = TavilySearchResults(
-            max_results=max_results,
-            search_depth="advanced",  # Use advanced search for better results
-            include_answer=True,      # Include AI-generated answer
-            include_raw_content=False # Don't include raw HTML
-        )
-        
         # Perform search
-        raw_results = tool.invoke(query)
-        
-        if not raw_results:
-            logger.warning("Tavily search returned no results")
-            return []
-        
-        # Process and standardize results
-        processed_results = []
-        
-        # Handle different possible result formats
-        if isinstance(raw_results, list):
-            for i, result in enumerate(raw_results):
-                if isinstance(result, dict):
-                    processed_result = process_tavily_result(result, i)
-                    if processed_result:
-                        processed_results.append(processed_result)
-                else:
-                    # Handle non-dict results
-                    logger.warning(f"Unexpected result format at index {i}: {type(result)}")
-                    processed_results.append({
-                        "content": str(result),
-                        "url": f"Search Result {i + 1}",
-                        "title": f"Web Search Result {i + 1}",
-                        "score": None
-                    })
-        
-        elif isinstance(raw_results, dict):
-            # Single result returned as dict
-            processed_result = process_tavily_result(raw_results, 0)
-            if processed_result:
-                processed_results.append(processed_result)
-        
-        else:
-            # Unexpected format
-            logger.warning(f"Unexpected Tavily result format: {type(raw_results)}")
-            processed_results.append({
-                "content": str(raw_results),
-                "url": "Web Search Result",
-                "title": "Search Result",
-                "score": None
-            })
-        
-        # Filter out empty or very short content
-        filtered_results = []
-        for result in processed_results:
-            content = result.get("content", "").strip()
-            if content and len(content) > 50:  # Minimum content length
-                filtered_results.append(result)
-            else:
-                logger.debug(f"Filtered out result with insufficient content: {result.get('title', 'Unknown')}")
-        
-        logger.info(f"Tavily search completed: {len(filtered_results)} usable results from {len(processed_results)} total")
-        
-        return filtered_results
+        raw_results = _tavily_tool(max_results).invoke(query)
+        results = process_tavily_results(raw_results)
+        if use_cache:
+            store_tavily_results(query, max_results, results)
+        return results
         
     except Exception as e:
-        logger.error(f"Error during Tavily search: {str(e)}")
-        
-        # Try to provide more specific error information
-        error_msg = str(e).lower()
-        if "api key" in error_msg or "authentication" in error_msg:
-            logger.error("Authentication error - check TAVILY_API_KEY")
-        elif "rate limit" in error_msg or "quota" in error_msg:
-            logger.error("Rate limit exceeded - try again later")
-        elif "network" in error_msg or "connection" in error_msg:
-            logger.error("Network connectivity issue")
-        else:
-            logger.error(f"Unknown error during Tavily search: {e}")
+        log_tavily_error(e)
+        return []
+
+
+async def asearch_tavily(query: str, max_results: int = 5, use_cache: bool = True) -> List[Dict]:
+    """
+    Async version of search_tavily using the tool's ainvoke, so a web search
+    does not hold a thread while waiting on the network. Returns results in
+    the same format.
+    """
+    
+    api_key = os.environ.get("TAVILY_API_KEY")
+    if not api_key:
+        logger.error("Tavily API key is not set in environment variables")
+        return []
+    
+    if use_cache:
+        cached = cached_tavily_results(query, max_results)
+        if cached is not None:
+            return cached
+    
+    try:
+        logger.info(f"Performing async Tavily search for: '{query}' (max_results: {max_results})")
+        raw_results = await _tavily_tool(max_results).ainvoke(query)
+        results = process_tavily_results(raw_results)
+        if use_cache:
+            store_tavily_results(query, max_results, results)
+        return results
         
+    except Exception as e:
+        log_tavily_error(e)
+        return []
+
+
+def _tavily_tool(max_results: int) -> TavilySearchResults:
+    return TavilySearchResults(
+        max_results=max_results,
+        search_depth="advanced",  # Use advanced search for better results
+        include_answer=True,      # Include AI-generated answer
+        include_raw_content=False # Don't include raw HTML
+    )
+
+
+def process_tavily_results(raw_results) -> List[Dict]:
+    """
+    Standardizes raw Tavily output (list, dict or other) and drops results
+    with too little content.
+    """
+    
+    if not raw_results:
+        logger.warning("Tavily search returned no results")
         return []
+    
+    # Process and standardize results
+    processed_results = []
+    
+    # Handle different possible result formats
+    if isinstance(raw_results, list):
+        for i, result in enumerate(raw_results):
+            if isinstance(result, dict):
+                processed_result = process_tavily_result(result, i)
+                if processed_result:
+                    processed_results.append(processed_result)
+            else:
+                # Handle non-dict results
+                logger.warning(f"Unexpected result format at index {i}: {type(result)}")
+                processed_results.append({
+                    "content": str(result),
+                    "url": f"Search Result {i + 1}",
+                    "title": f"Web Search Result {i + 1}",
+                    "score": None
+                })
+    
+    elif isinstance(raw_results, dict):
+        # Single result returned as dict
+        processed_result = process_tavily_result(raw_results, 0)
+        if processed_result:
+            processed_results.append(processed_result)
+    
+    else:
+        # Unexpected format
+        logger.warning(f"Unexpected Tavily result format: {type(raw_results)}")
+        processed_results.append({
+            "content": str(raw_results),
+            "url": "Web Search Result",
+            "title": "Search Result",
+            "score": None
+        })
+    
+    # Filter out empty or very short content
+    filtered_results = []
+    for result in processed_results:
+        content = result.get("content", "").strip()
+        if content and len(content) > 50:  # Minimum content length
+            filtered_results.append(result)
+        else:
+            logger.debug(f"Filtered out result with insufficient content: {result.get('title', 'Unknown')}")
+    
+    logger.info(f"Tavily search completed: {len(filtered_results)} usable results from {len(processed_results)} total")
+    
+    return filtered_results
+
+
+def log_tavily_error(e: Exception) -> None:
+    """Logs a Tavily failure with a hint at the likely cause."""
+    logger.error(f"Error during Tavily search: {str(e)}")
+    
+    # Try to provide more specific error information
+    error_msg = str(e).lower()
+    if "api key" in error_msg or "authentication" in error_msg:
+        logger.error("Authentication error - check TAVILY_API_KEY")
+    elif "rate limit" in error_msg or "quota" in error_msg:
+        logger.error("Rate limit exceeded - try again later")
+    elif "network" in error_msg or "connection" in error_msg:
+        logger.error("Network connectivity issue")
+    else:
+        logger.error(f"Unknown error during Tavily search: {e}")
 
 
 def process_tavily_result(result: Dict, index: int) -> Optional[Dict]:
@@ -239,7 +330,8 @@ def test_tavily_connection() -> Dict[str, any]:
         "api_key_configured": False,
         "connection_successful": False,
         "test_query_results": 0,
-        "error_message": None
+        "error_message": None,
+        "cache": dict(tavily_cache.stats(), enabled=TAVILY_CACHE_ENABLED, ttl_seconds=TAVILY_CACHE_TTL_SECONDS)
     }
     
     # Check API key
@@ -250,9 +342,9 @@ def test_tavily_connection() -> Dict[str, any]:
         status["error_message"] = "TAVILY_API_KEY environment variable not set"
         return status
     
-    # Test with a simple query
+    # Test with a simple query, bypassing the cache so the API is really reached
     try:
-        results = search_tavily("test query", max_results=1)
+        results = search_tavily("test query", max_results=1, use_cache=False)
         status["connection_successful"] = True
         status["test_query_results"] = len(results)
         
@@ -268,6 +360,71 @@ def test_tavily_connection() -> Dict[str, any]:
     return status
 
 
+class TavilyPrefetch:
+    """One search_tavily call running in the background; see TavilyPrefetcher."""
+
+    def __init__(self, prefetcher: "TavilyPrefetcher", query: str, max_results: int):
+        self.query = query
+        self.max_results = max_results
+        self.search_seconds: Optional[float] = None
+        self._prefetcher = prefetcher
+        self._future = prefetcher._executor.submit(self._search)
+
+    def _search(self) -> List[Dict]:
+        start = time.perf_counter()
+        try:
+            return search_tavily(self.query, self.max_results)
+        finally:
+            self.search_seconds = time.perf_counter() - start
+
+    def result(self, timeout: Optional[float] = None) -> List[Dict]:
+        """Waits for the prefetched results and records how much search time was saved."""
+        start = time.perf_counter()
+        results = self._future.result(timeout)
+        waited = time.perf_counter() - start
+        saved = max(0.0, (self.search_seconds or 0.0) - waited)
+        self._prefetcher._record("used", saved)
+        logger.info(f"🛰️ Using prefetched web results: saved {saved:.2f}s of a {self.search_seconds or 0.0:.2f}s search")
+        return results
+
+    def cancel(self) -> None:
+        """Drops an unneeded prefetch: cancelled if not started, else left to finish into the Tavily cache."""
+        if self._future.cancel():
+            self._prefetcher._record("cancelled")
+        else:
+            self._prefetcher._record("cached" if TAVILY_CACHE_ENABLED else "wasted")
+
+
+class TavilyPrefetcher:
+    """
+    Starts Tavily searches ahead of need on a small thread pool. Unused
+    prefetches are cancelled if they have not started; ones already running
+    finish and are kept in the Tavily cache for the next identical search.
+    stats() reports how prefetches ended and the total search time saved.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tavily-prefetch")
+        self._lock = threading.Lock()
+        self._counters = {"started": 0, "used": 0, "cancelled": 0, "cached": 0, "wasted": 0}
+        self.seconds_saved = 0.0
+
+    def start(self, query: str, max_results: int = 5) -> TavilyPrefetch:
+        self._record("started")
+        return TavilyPrefetch(self, query, max_results)
+
+    def _record(self, outcome: str, seconds_saved: float = 0.0) -> None:
+        with self._lock:
+            self._counters[outcome] += 1
+            self.seconds_saved += seconds_saved
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["seconds_saved"] = round(self.seconds_saved, 3)
+        return stats
+
+
 # Additional utility function for debugging
 def search_tavily_debug(query: str, max_results: int = 3) -> Dict:
     """
@@ -306,4 +463,4 @@ def search_tavily_debug(query: str, max_results: int = 3) -> Dict:
 
 
 # Export main functions
-__all__ = ['search_tavily', 'test_tavily_connection', 'search_tavily_debug']
\ No newline at end of file
+__all__ = ['search_tavily', 'asearch_tavily', 'test_tavily_connection', 'search_tavily_debug', 'TavilyPrefetcher']
\ No newline at end of file
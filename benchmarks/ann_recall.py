@@ -0,0 +1,101 @@
+"""
+Recall@5 and single-query latency of the approximate index types against the
+exact flat baseline, on the vectors of our own knowledge base.
+
+Corpus vectors are read from existing indexes under persistent_storage/. A
+random sample of them is held out as queries (and left out of the indexes),
+so every index answers the same unseen queries. The flat index's top-5
+results are the ground truth.
+
+Usage (from the repository root, after build_knowledge_base.py):
+    python -m benchmarks.ann_recall
+    python -m benchmarks.ann_recall --index persistent_storage/unified_faiss_index --queries 500 --threads 1
+"""
+import os
+import time
+import argparse
+from typing import Dict, List
+
+import numpy as np
+import faiss
+
+from backend.index_factory import INDEX_TYPES, create_index, index_vectors, search_params_of
+
+DEFAULT_INDEXES = [
+    os.path.join("persistent_storage", "doc_faiss_index"),
+    os.path.join("persistent_storage", "scraped_faiss_index"),
+    os.path.join("persistent_storage", "youtube_faiss_index")
+]
+K = 5
+
+
+def load_corpus(index_paths: List[str]) -> np.ndarray:
+    """Stacks the stored vectors of every existing index."""
+    vectors = []
+    for index_path in index_paths:
+        faiss_file = os.path.join(index_path, "index.faiss")
+        if os.path.exists(faiss_file):
+            index = faiss.read_index(faiss_file)
+            vectors.append(index_vectors(index))
+            print(f"  {index_path}: {index.ntotal} vectors")
+    if not vectors:
+        raise SystemExit("No indexes found - run build_knowledge_base.py first")
+    return np.ascontiguousarray(np.vstack(vectors), dtype=np.float32)
+
+
+def measure(index: faiss.Index, queries: np.ndarray, ground_truth: np.ndarray) -> Dict[str, float]:
+    """Recall@K against the ground truth plus p50/p99 latency of one-query searches."""
+    latencies = []
+    hits = 0
+    for query, truth in zip(queries, ground_truth):
+        start = time.perf_counter()
+        _, ids = index.search(query.reshape(1, -1), K)
+        latencies.append(time.perf_counter() - start)
+        hits += len(set(ids[0].tolist()) & set(truth.tolist()))
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "recall": hits / (len(queries) * K),
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark approximate FAISS index types against flat search")
+    parser.add_argument("--index", action="append", help="Index directory to take vectors from (repeatable)")
+    parser.add_argument("--queries", type=int, default=200, help="Number of held-out query vectors")
+    parser.add_argument("--types", nargs="+", default=list(INDEX_TYPES), choices=INDEX_TYPES)
+    parser.add_argument("--threads", type=int, default=0, help="FAISS OpenMP threads (0 = library default)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.threads:
+        faiss.omp_set_num_threads(args.threads)
+
+    print("Loading corpus vectors:")
+    corpus = load_corpus(args.index or DEFAULT_INDEXES)
+    rng = np.random.default_rng(args.seed)
+    num_queries = min(args.queries, len(corpus) // 10)
+    held_out = rng.choice(len(corpus), num_queries, replace=False)
+    mask = np.ones(len(corpus), dtype=bool)
+    mask[held_out] = False
+    queries, database = corpus[held_out], corpus[mask]
+    print(f"{len(database)} indexed vectors, {num_queries} held-out queries, dim {corpus.shape[1]}\n")
+
+    exact = faiss.IndexFlatL2(database.shape[1])
+    exact.add(database)
+    _, ground_truth = exact.search(queries, K)
+
+    print(f"{'type':<10} {'build s':>8} {'size MB':>8} {'recall@5':>9} {'p50 ms':>8} {'p99 ms':>8}  params")
+    for index_type in args.types:
+        start = time.perf_counter()
+        index, _ = create_index(database, index_type, seed=args.seed)
+        build_seconds = time.perf_counter() - start
+        size_mb = faiss.serialize_index(index).nbytes / (1024 * 1024)
+        result = measure(index, queries, ground_truth)
+        print(f"{index_type:<10} {build_seconds:>8.1f} {size_mb:>8.1f} {result['recall']:>9.3f} "
+              f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f}  {search_params_of(index)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Prompt size and LLM latency with and without extractive context compression
+(SearchConfig.CONTEXT_COMPRESSION, see backend/context.compress_context).
+
+For each query the top chunks are retrieved once, then the prompt is built
+twice: with token-budget packing only, and with packing plus compression.
+Reports prompt tokens, the time compression adds and, with --llm, the
+Together completion latency of both prompts (needs TOGETHER_API_KEY).
+
+Usage (from the repository root, after build_knowledge_base.py):
+    python -m benchmarks.context_compression
+    python -m benchmarks.context_compression --queries my_questions.txt --llm --budget 400
+"""
+import time
+import argparse
+from statistics import mean, median
+from typing import Dict, List
+
+from backend import qa_chain
+from backend.qa_chain import SearchConfig, build_llm_prompt, retrieve
+from backend.tokens import count_tokens
+
+DEFAULT_QUERIES = [
+    "What are the main objectives of the National Digital Communications Policy?",
+    "How does Digital India initiative promote digital literacy?",
+    "What are the cybersecurity guidelines for government organizations?",
+    "Explain the IT Act 2000 and its amendments",
+    "What is the role of MeitY in promoting startups?"
+]
+
+
+def time_llm(prompt: str) -> float:
+    start = time.perf_counter()
+    qa_chain.llm_client.invoke(prompt)
+    return time.perf_counter() - start
+
+
+def measure(query: str, use_llm: bool) -> Dict[str, float]:
+    retrieved = retrieve(query)
+    docs, scores = retrieved["source_documents"], retrieved["similarity_scores"]
+    if not docs:
+        return {}
+
+    SearchConfig.CONTEXT_COMPRESSION = False
+    start = time.perf_counter()
+    full_prompt = build_llm_prompt(query, docs, scores)
+    full_seconds = time.perf_counter() - start
+
+    SearchConfig.CONTEXT_COMPRESSION = True
+    start = time.perf_counter()
+    compressed_prompt = build_llm_prompt(query, docs, scores)
+    compressed_seconds = time.perf_counter() - start
+
+    result = {
+        "full_tokens": count_tokens(full_prompt),
+        "compressed_tokens": count_tokens(compressed_prompt),
+        "compression_ms": (compressed_seconds - full_seconds) * 1000
+    }
+    if use_llm:
+        result["full_llm_s"] = time_llm(full_prompt)
+        result["compressed_llm_s"] = time_llm(compressed_prompt)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extractive context compression")
+    parser.add_argument("--queries", help="File with one question per line (default: the app's example questions)")
+    parser.add_argument("--budget", type=int, default=SearchConfig.COMPRESSION_TOKEN_BUDGET, help="Compression token budget")
+    parser.add_argument("--llm", action="store_true", help="Also time Together completions for both prompts")
+    args = parser.parse_args()
+
+    queries = DEFAULT_QUERIES
+    if args.queries:
+        with open(args.queries, "r", encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+    SearchConfig.COMPRESSION_TOKEN_BUDGET = args.budget
+
+    results: List[Dict[str, float]] = []
+    print(f"{'full tok':>9} {'comp tok':>9} {'saved':>6} {'comp ms':>8}  query")
+    for query in queries:
+        result = measure(query, args.llm)
+        if not result:
+            print(f"{'-':>9} {'-':>9} {'-':>6} {'-':>8}  {query[:60]} (no context retrieved)")
+            continue
+        results.append(result)
+        saved = 1 - result["compressed_tokens"] / result["full_tokens"]
+        print(f"{result['full_tokens']:>9} {result['compressed_tokens']:>9} {saved:>6.0%} {result['compression_ms']:>8.0f}  {query[:60]}")
+
+    if not results:
+        raise SystemExit("No query retrieved any context - run build_knowledge_base.py first")
+
+    full = mean(r["full_tokens"] for r in results)
+    compressed = mean(r["compressed_tokens"] for r in results)
+    print(f"\nMean prompt tokens: {full:.0f} -> {compressed:.0f} ({1 - compressed / full:.0%} smaller), "
+          f"compression adds {mean(r['compression_ms'] for r in results):.0f} ms (budget {args.budget})")
+    if args.llm:
+        print(f"Median LLM latency: {median(r['full_llm_s'] for r in results):.2f}s -> "
+              f"{median(r['compressed_llm_s'] for r in results):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Local stand-in for the Together chat-completions endpoint, for benchmarks.
+
+Speaks enough of the OpenAI-compatible API for ChatTogether (plain and
+streamed /chat/completions). Latency and failures are injectable, and the
+server counts requests and peak concurrency so client-side limits can be
+checked.
+
+    server = FakeLLMServer(latency=lambda: 0.2, error_rate=0.05).start()
+    client = LLMClientManager(..., base_url=server.url)
+    ...
+    server.stop()
+
+Run on its own to serve until interrupted:
+    python -m benchmarks.fake_llm_server --port 8765 --latency-ms 300
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+ANSWER = ("MeitY (Ministry of Electronics and Information Technology) leads the Digital India programme, "
+          "which aims to transform India into a digitally empowered society and knowledge economy.")
+
+
+class FakeLLMServer:
+    """
+    Threaded HTTP server answering chat completions after `latency()`
+    seconds; a share `error_rate` of requests get `error_status` instead.
+    Streamed responses split the answer into words spread over the latency.
+    """
+
+    def __init__(self, latency: Callable[[], float] = lambda: 0.2, error_rate: float = 0.0,
+                 error_status: int = 503, answer: str = ANSWER, port: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.answer = answer
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-llm-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests = self.errors = self.peak_in_flight = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"requests": self.requests, "errors": self.errors, "peak_in_flight": self.peak_in_flight}
+
+    def _enter(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _exit(self, error: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.errors += int(error)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, so client connection pooling is visible
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: Dict) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if not self.path.endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+
+                server._enter()
+                failed = random.random() < server.error_rate
+                try:
+                    delay = server.latency()
+                    if failed:
+                        time.sleep(delay / 4)
+                        self._send_json(server.error_status, {"error": {"message": "injected failure", "type": "server_error"}})
+                    elif request.get("stream"):
+                        self._stream(request, delay)
+                    else:
+                        time.sleep(delay)
+                        self._send_json(200, self._completion(request))
+                finally:
+                    server._exit(failed)
+
+            def _completion(self, request: Dict) -> Dict:
+                return {
+                    "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+                    "model": request.get("model", "fake"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": server.answer}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": len(server.answer.split()), "total_tokens": 0}
+                }
+
+            def _stream(self, request: Dict, delay: float) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                words = server.answer.split(" ")
+                # Time to first token is half the latency, the rest is spread over the words
+                time.sleep(delay / 2)
+                for i, word in enumerate(words):
+                    chunk = {
+                        "id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()),
+                        "model": request.get("model", "fake"),
+                        "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}, "finish_reason": None}]
+                    }
+                    self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+                    time.sleep(delay / 2 / len(words))
+                self._write_chunk("data: [DONE]\n\n")
+                self._write_chunk("")
+
+            def _write_chunk(self, text: str) -> None:
+                data = text.encode("utf-8")
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake Together chat-completions endpoint")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(latency=lambda: args.latency_ms / 1000, error_rate=args.error_rate, port=args.port).start()
+    print(f"Serving fake LLM at {server.url} (set TOGETHER_API_BASE to use it); Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
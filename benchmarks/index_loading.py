@@ -0,0 +1,120 @@
+"""
+Compares memory and first-query latency of FAISS.load_local against the
+mmap loader in backend.qa_chain.load_faiss_index.
+
+Several worker processes load the same index at the same time, the way
+several Streamlit workers in one container would. Each worker reports how
+much its RSS, PSS and private memory grew while loading the index and
+running the first search. With mmap the index pages are shared, so PSS and
+private memory per worker should drop while RSS stays similar. Both rows
+read the docstore from index.pkl (use_chunk_store=False), so the memory
+row is plain FAISS.load_local even when the index has a chunks.sqlite.
+
+Usage (from the repository root, after build_knowledge_base.py):
+    python -m benchmarks.index_loading --index persistent_storage/doc_faiss_index --workers 3
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from statistics import mean
+from typing import Dict, List
+
+import numpy as np
+
+
+def read_memory_kb() -> Dict[str, int]:
+    """Rss, Pss and private memory of this process in kB (Linux smaps_rollup)."""
+    memory = {"rss": 0, "pss": 0, "private": 0}
+    try:
+        with open("/proc/self/smaps_rollup", "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                kb = int(value.split()[0]) if value.strip() else 0
+                if key == "Rss":
+                    memory["rss"] = kb
+                elif key == "Pss":
+                    memory["pss"] = kb
+                elif key in ("Private_Clean", "Private_Dirty"):
+                    memory["private"] += kb
+    except (OSError, ValueError, IndexError):
+        import resource
+        memory["rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return memory
+
+
+def run_worker(index_path: str, mode: str) -> None:
+    """Loads the index, runs one search, then reports memory once the parent says all workers are up."""
+    from backend.qa_chain import load_faiss_index
+
+    before = read_memory_kb()
+    start = time.perf_counter()
+    vectordb = load_faiss_index(index_path, mode, use_chunk_store=False)
+    load_seconds = time.perf_counter() - start
+
+    query = np.random.default_rng(0).standard_normal(vectordb.index.d).astype(np.float32)
+    query /= np.linalg.norm(query)
+    start = time.perf_counter()
+    vectordb.similarity_search_with_score_by_vector(query, k=5)
+    first_query_seconds = time.perf_counter() - start
+
+    print(json.dumps({"ready": True}), flush=True)
+    sys.stdin.readline()  # Parent signals once every worker has loaded
+
+    after = read_memory_kb()
+    print(json.dumps({
+        "load_seconds": load_seconds,
+        "first_query_seconds": first_query_seconds,
+        "delta_kb": {key: after[key] - before[key] for key in after}
+    }), flush=True)
+
+
+def run_mode(index_path: str, mode: str, workers: int) -> List[Dict]:
+    """Starts `workers` processes for one load mode and collects their reports."""
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.index_loading", "--index", index_path, "--worker", mode],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        json.loads(process.stdout.readline())
+    for process in processes:
+        process.stdin.write("measure\n")
+        process.stdin.flush()
+    reports = [json.loads(process.stdout.readline()) for process in processes]
+    for process in processes:
+        process.wait()
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FAISS index loading modes")
+    parser.add_argument("--index", default=os.path.join("persistent_storage", "doc_faiss_index"))
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--worker", choices=["memory", "mmap"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.index, args.worker)
+        return
+
+    size_mb = os.path.getsize(os.path.join(args.index, "index.faiss")) / (1024 * 1024)
+    print(f"Index: {args.index} ({size_mb:.1f} MB index.faiss), {args.workers} concurrent workers\n")
+    print(f"{'mode':<8} {'load s':>8} {'1st query ms':>13} {'RSS MB':>8} {'PSS MB':>8} {'private MB':>11}")
+    for mode in ("memory", "mmap"):
+        reports = run_mode(args.index, mode, args.workers)
+        print(f"{mode:<8} "
+              f"{mean([r['load_seconds'] for r in reports]):>8.2f} "
+              f"{mean([r['first_query_seconds'] for r in reports]) * 1000:>13.1f} "
+              f"{mean([r['delta_kb']['rss'] for r in reports]) / 1024:>8.1f} "
+              f"{mean([r['delta_kb']['pss'] for r in reports]) / 1024:>8.1f} "
+              f"{mean([r['delta_kb']['private'] for r in reports]) / 1024:>11.1f}")
+    print("\nMemory columns are per-worker growth while loading the index and running the first query.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Throughput of the pooled LLM client (backend/llm_client.LLMClientManager)
+against a ChatTogether created per call, the way ask_llm used to work.
+
+Both run the same requests from many threads against a local stand-in
+server (benchmarks/fake_llm_server.py) with injectable latency and error
+rate, so nothing is sent to Together. Reports throughput, latency
+percentiles, failed calls, the server-side peak concurrency and the
+manager's retry and throttling counters.
+
+Usage (from the repository root):
+    python -m benchmarks.llm_client
+    python -m benchmarks.llm_client --requests 400 --threads 32 --latency-ms 200 --error-rate 0.05 --max-in-flight 8 --rps 50
+"""
+import os
+import time
+import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+import numpy as np
+
+from backend.llm_client import LLMClientManager
+from benchmarks.fake_llm_server import FakeLLMServer
+
+MODEL = "mistralai/Mistral-7B-Instruct-v0.2"
+PROMPT = "What is the role of MeitY in promoting startups?"
+
+
+def run(call: Callable[[], str], requests: int, threads: int) -> Dict[str, float]:
+    """Runs `requests` calls on `threads` threads; returns throughput, latency percentiles and failures."""
+    def timed(_):
+        start = time.perf_counter()
+        try:
+            call()
+            return time.perf_counter() - start, False
+        except Exception:
+            return time.perf_counter() - start, True
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(timed, range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies = np.array([seconds for seconds, _ in results]) * 1000
+    return {
+        "throughput": requests / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "failed": sum(failed for _, failed in results)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pooled LLM client against a local stand-in server")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=32, help="Concurrent callers")
+    parser.add_argument("--latency-ms", type=float, default=200, help="Mean server latency")
+    parser.add_argument("--jitter-ms", type=float, default=50, help="Uniform +/- jitter on the latency")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Share of requests answered with 503")
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=0, help="Token-bucket rate for the manager (0 = unlimited)")
+    parser.add_argument("--stream", action="store_true", help="Use streamed completions")
+    args = parser.parse_args()
+
+    os.environ.setdefault("TOGETHER_API_KEY", "local-stand-in")
+    server = FakeLLMServer(
+        latency=lambda: max(0.0, (args.latency_ms + random.uniform(-args.jitter_ms, args.jitter_ms)) / 1000),
+        error_rate=args.error_rate
+    ).start()
+
+    manager = LLMClientManager(
+        model=MODEL, temperature=0.3, max_tokens=1000, max_in_flight=args.max_in_flight,
+        requests_per_second=args.rps, burst=max(args.rps, 1), base_url=server.url
+    )
+
+    def per_call_client() -> str:
+        from langchain_together import ChatTogether
+        llm = ChatTogether(model=MODEL, temperature=0.3, max_tokens=1000, base_url=server.url)
+        if args.stream:
+            return "".join(chunk.content for chunk in llm.stream(PROMPT))
+        return llm.invoke(PROMPT).content
+
+    def pooled_client() -> str:
+        if args.stream:
+            return "".join(manager.stream(PROMPT))
+        return manager.invoke(PROMPT)
+
+    print(f"{args.requests} requests from {args.threads} threads, server latency {args.latency_ms:.0f}±{args.jitter_ms:.0f}ms, "
+          f"error rate {args.error_rate:.0%}{', streamed' if args.stream else ''}\n")
+    print(f"{'client':<16} {'req/s':>7} {'p50 ms':>8} {'p99 ms':>8} {'failed':>7} {'server reqs':>12} {'peak conc':>10}")
+    for name, call in (("per-call", per_call_client), ("pooled manager", pooled_client)):
+        server.reset_counters()
+        result = run(call, args.requests, args.threads)
+        served = server.stats()
+        print(f"{name:<16} {result['throughput']:>7.1f} {result['p50_ms']:>8.0f} {result['p99_ms']:>8.0f} "
+              f"{result['failed']:>7} {served['requests']:>12} {served['peak_in_flight']:>10}")
+
+    print(f"\nManager counters: {manager.stats()}")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Tail latency of streamed LLM calls with and without hedged requests
+(SearchConfig.LLM_HEDGING, see backend/llm_client.HedgingPolicy).
+
+Runs against a local stand-in server (benchmarks/fake_llm_server.py) whose
+latency is usually fast but occasionally very slow, so nothing is sent to
+Together. Both clients first warm up so the hedging policy has a latency
+history, then run the same number of calls. Reports latency percentiles,
+how many requests the server actually received and the hedging counters.
+
+Usage (from the repository root):
+    python -m benchmarks.llm_hedging
+    python -m benchmarks.llm_hedging --calls 300 --threads 4 --slow-rate 0.05 --slow-ms 3000 --percentile 90
+"""
+import os
+import time
+import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+import numpy as np
+
+from backend.llm_client import HedgingPolicy, LLMClientManager
+from benchmarks.fake_llm_server import FakeLLMServer
+
+MODEL = "mistralai/Mistral-7B-Instruct-v0.2"
+PROMPT = "What is the role of MeitY in promoting startups?"
+
+
+def run(manager: LLMClientManager, calls: int, threads: int) -> Dict[str, float]:
+    """Streams `calls` completions on `threads` threads; returns latency percentiles in ms."""
+    def timed(_):
+        start = time.perf_counter()
+        "".join(manager.stream_hedged(PROMPT))
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = np.array(list(pool.map(timed, range(calls)))) * 1000
+    return {p: float(np.percentile(latencies, p)) for p in (50, 95, 99)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hedged LLM requests against a local stand-in server")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=40, help="Calls before measuring, to fill the latency history")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent callers")
+    parser.add_argument("--latency-ms", type=float, default=150, help="Usual server latency")
+    parser.add_argument("--slow-rate", type=float, default=0.05, help="Share of requests that are slow")
+    parser.add_argument("--slow-ms", type=float, default=2000, help="Latency of a slow request")
+    parser.add_argument("--percentile", type=float, default=95, help="Hedge after this percentile of recent latencies")
+    parser.add_argument("--max-hedge-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    def latency() -> float:
+        if random.random() < args.slow_rate:
+            return args.slow_ms / 1000
+        return args.latency_ms * random.uniform(0.8, 1.2) / 1000
+
+    os.environ.setdefault("TOGETHER_API_KEY", "local-stand-in")
+    server = FakeLLMServer(latency=latency).start()
+
+    print(f"{args.calls} streamed calls from {args.threads} threads, server latency {args.latency_ms:.0f}ms "
+          f"with {args.slow_rate:.0%} at {args.slow_ms:.0f}ms; hedge at p{args.percentile:g}, "
+          f"max hedge rate {args.max_hedge_rate:.0%}\n")
+    print(f"{'client':<10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'server reqs':>12}")
+    for name, hedging in (("plain", None),
+                          ("hedged", HedgingPolicy(percentile=args.percentile, max_hedge_rate=args.max_hedge_rate,
+                                                   min_samples=min(20, args.warmup)))):
+        manager = LLMClientManager(model=MODEL, temperature=0.3, max_tokens=1000, max_in_flight=2 * args.threads,
+                                   requests_per_second=0, base_url=server.url, hedging=hedging)
+        run(manager, args.warmup, args.threads)
+        server.reset_counters()
+        result = run(manager, args.calls, args.threads)
+        served = server.stats()
+        print(f"{name:<10} {result[50]:>8.0f} {result[95]:>8.0f} {result[99]:>8.0f} {served['requests']:>12}")
+        if hedging is not None:
+            print(f"\nHedging counters: {hedging.stats()}")
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,23 @@
 import os
 import shutil
 import re
+import json
+import uuid
 import hashlib
 import logging
 from datetime import datetime  # ← This import was missing
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional
+import numpy as np
 from bs4 import BeautifulSoup
 from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader, UnstructuredPowerPointLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
 from langchain_community.embeddings import SentenceTransformerEmbeddings
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain.docstore.document import Document
+from backend.chunk_store import CHUNK_STORE_FILE, write_chunk_store
+from backend.tokens import count_tokens_batch
+from backend.index_factory import INDEX_TYPES, create_index, index_type_of, index_vectors, save_index_params
 from yt_dlp import YoutubeDL
 import whisper
 from playwright.sync_api import sync_playwright
@@ -42,11 +49,38 @@ PERSISTENT_DIR = "persistent_storage"
 DOC_FAISS_PATH = os.path.join(PERSISTENT_DIR, "doc_faiss_index")
 SCRAPED_FAISS_PATH = os.path.join(PERSISTENT_DIR, "scraped_faiss_index")
 YOUTUBE_FAISS_PATH = os.path.join(PERSISTENT_DIR, "youtube_faiss_index")
+UNIFIED_FAISS_PATH = os.path.join(PERSISTENT_DIR, "unified_faiss_index")
+TIER_PARTITIONS_FILE = "tier_partitions.json"
 COOKIE_FILE_PATH = os.path.join(PERSISTENT_DIR, 'cookies.txt')
 SCRAPED_TEXT_DIR = os.path.join(PERSISTENT_DIR, "scraped_content")
 YOUTUBE_TEXT_DIR = os.path.join(PERSISTENT_DIR, "youtube_transcripts")
 HASH_LOG_PATH = os.path.join(PERSISTENT_DIR, 'processed_hashes.log')
 
+# --- CHUNK STORE ---
+# Write chunks.sqlite next to each index so the Q&A service reads chunks lazily
+# instead of unpickling index.pkl (which is still written for incremental builds)
+WRITE_CHUNK_STORE = True
+CHUNK_STORE_COMPRESSION = os.environ.get("CHUNK_STORE_COMPRESSION")  # "zstd" or unset
+
+# --- INDEX TYPE ---
+# flat is exact search; ivf_flat, hnsw and ivf_pq are approximate and keep
+# search cost sub-linear as the corpus grows (see backend/index_factory.py
+# and benchmarks/ann_recall.py for the recall/latency trade-off)
+FAISS_INDEX_TYPE = os.environ.get("FAISS_INDEX_TYPE", "flat").lower()
+if FAISS_INDEX_TYPE not in INDEX_TYPES:
+    logger.warning(f"Unknown FAISS_INDEX_TYPE '{FAISS_INDEX_TYPE}', using flat (options: {INDEX_TYPES})")
+    FAISS_INDEX_TYPE = "flat"
+
+# --- UNIFIED INDEX ---
+# Optionally merge the three tier indexes into one index whose vectors are
+# tagged with their tier, so the Q&A service can search all tiers in one call
+BUILD_UNIFIED_INDEX = os.environ.get("BUILD_UNIFIED_INDEX", "false").lower() == "true"
+UNIFIED_TIERS = [
+    ("document", DOC_FAISS_PATH),
+    ("web", SCRAPED_FAISS_PATH),
+    ("youtube", YOUTUBE_FAISS_PATH)
+]
+
 # --- MODELS (Load once with error handling) ---
 try:
     embeddings_model = SentenceTransformerEmbeddings(model_name="BAAI/bge-large-en-v1.5")
@@ -58,7 +92,8 @@ except Exception as e:
 text_splitter = RecursiveCharacterTextSplitter(
     chunk_size=1000,
     chunk_overlap=100,
-    separators=["\n\n", "\n", " ", ""]
+    separators=["\n\n", "\n", " ", ""],
+    add_start_index=True  # Lets the Q&A service merge overlapping neighbour chunks
 )
 
 # --- HASHING HELPER FUNCTIONS ---
@@ -108,6 +143,18 @@ def save_processed_hashes(log_path: str, hashes_set: Set[str]) -> None:
         logger.error(f"Error saving processed hashes: {e}")
 
 # --- ENHANCED BUILD FUNCTION ---
+def apply_index_type(vectordb: FAISS, index_type: str, index_name: str = "Unknown") -> FAISS:
+    """Rebuilds the store's FAISS index as index_type from its stored vectors, keeping FAISS ids."""
+    current_type = index_type_of(vectordb.index)
+    if current_type == index_type:
+        return vectordb
+
+    logger.info(f"Converting {index_name} index from {current_type} to {index_type}...")
+    index, params = create_index(index_vectors(vectordb.index), index_type)
+    vectordb.index = index
+    logger.info(f"{index_name} index search params: {params}")
+    return vectordb
+
 def build_faiss_index(docs_to_add: List[Document], index_path: str, index_name: str = "Unknown") -> None:
     """Builds or updates a FAISS index in batches with enhanced error handling."""
     
@@ -115,6 +162,12 @@ def build_faiss_index(docs_to_add: List[Document], index_path: str, index_name:
         logger.info(f"No documents to add for {index_name} index")
         if not os.path.exists(index_path):
             os.makedirs(index_path, exist_ok=True)
+        elif (WRITE_CHUNK_STORE and os.path.exists(os.path.join(index_path, "index.faiss"))
+              and not os.path.exists(os.path.join(index_path, CHUNK_STORE_FILE))):
+            # Index built before chunk stores existed - write one without re-embedding
+            logger.info(f"Writing missing chunk store for existing {index_name} index...")
+            vectordb = FAISS.load_local(index_path, embeddings_model, allow_dangerous_deserialization=True)
+            write_chunk_store(index_path, vectordb, CHUNK_STORE_COMPRESSION)
         return
 
     try:
@@ -127,6 +180,10 @@ def build_faiss_index(docs_to_add: List[Document], index_path: str, index_name:
             logger.warning(f"No chunks created for {index_name} - documents may be empty")
             return
 
+        # Store each chunk's token count so the Q&A service can pack prompts without re-tokenizing
+        for doc, token_count in zip(chunked_docs, count_tokens_batch([doc.page_content for doc in chunked_docs])):
+            doc.metadata["token_count"] = token_count
+
         batch_size = 256  # Adjust based on memory constraints
         
         # Check if index already exists
@@ -167,12 +224,18 @@ def build_faiss_index(docs_to_add: List[Document], index_path: str, index_name:
                     # Add to existing index
                     vectordb.add_documents(batch)
 
-        # Save the index
+        # Convert to the configured index type (trains IVF/PQ on a sample of the vectors)
+        vectordb = apply_index_type(vectordb, FAISS_INDEX_TYPE, index_name)
+        
+        # Save the index together with its search parameters (nprobe/efSearch)
         vectordb.save_local(index_path)
+        save_index_params(index_path, vectordb.index)
         
         # Verify the save was successful
         if os.path.exists(faiss_file_path):
             logger.info(f"✅ {index_name} index successfully saved to {index_path}")
+            if WRITE_CHUNK_STORE:
+                write_chunk_store(index_path, vectordb, CHUNK_STORE_COMPRESSION)
         else:
             logger.error(f"❌ Failed to save {index_name} index to {index_path}")
             
@@ -180,6 +243,58 @@ def build_faiss_index(docs_to_add: List[Document], index_path: str, index_name:
         logger.error(f"Error building {index_name} index: {e}")
         raise
 
+def build_unified_index(index_path: str = UNIFIED_FAISS_PATH) -> Optional[FAISS]:
+    """
+    Merges the tier indexes into one index tagged by tier, reusing their stored vectors.
+
+    Tiers are added one after another, so each tier occupies a contiguous FAISS
+    id range. The ranges are written to tier_partitions.json and every chunk's
+    metadata gets a "tier_key" (document, web or youtube). The index is rebuilt
+    from the tier indexes on every run, so it never drifts from them.
+    """
+    logger.info("Building unified index from tier indexes...")
+    vectors, docs, partitions = [], [], {}
+    offset = 0
+
+    for tier_key, tier_path in UNIFIED_TIERS:
+        if not os.path.exists(os.path.join(tier_path, "index.faiss")):
+            logger.info(f"No {tier_key} index found, leaving its partition empty")
+            partitions[tier_key] = [offset, offset]
+            continue
+
+        tier_db = FAISS.load_local(tier_path, embeddings_model, allow_dangerous_deserialization=True)
+        count = tier_db.index.ntotal
+        vectors.append(index_vectors(tier_db.index))
+        for faiss_id in range(count):
+            doc = tier_db.docstore.search(tier_db.index_to_docstore_id[faiss_id])
+            docs.append(Document(page_content=doc.page_content, metadata={**doc.metadata, "tier_key": tier_key}))
+        partitions[tier_key] = [offset, offset + count]
+        offset += count
+
+    if not docs:
+        logger.warning("No tier indexes to merge - unified index not built")
+        return None
+
+    index, params = create_index(np.vstack(vectors), FAISS_INDEX_TYPE)
+    doc_ids = [str(uuid.uuid4()) for _ in docs]
+    vectordb = FAISS(
+        embedding_function=embeddings_model,
+        index=index,
+        docstore=InMemoryDocstore(dict(zip(doc_ids, docs))),
+        index_to_docstore_id=dict(enumerate(doc_ids))
+    )
+
+    os.makedirs(index_path, exist_ok=True)
+    vectordb.save_local(index_path)
+    save_index_params(index_path, index)
+    with open(os.path.join(index_path, TIER_PARTITIONS_FILE), "w", encoding="utf-8") as f:
+        json.dump(partitions, f)
+    if WRITE_CHUNK_STORE:
+        write_chunk_store(index_path, vectordb, CHUNK_STORE_COMPRESSION)
+
+    logger.info(f"✅ Unified index saved to {index_path} ({index.ntotal} vectors, {params}, partitions: {partitions})")
+    return vectordb
+
 # --- ENHANCED PROCESSING FUNCTIONS ---
 
 def process_local_documents(processed_hashes: Set[str]) -> List[Document]:
@@ -621,6 +736,9 @@ def main():
         build_faiss_index(web_docs, SCRAPED_FAISS_PATH, "Scraped Websites")
         build_faiss_index(youtube_docs, YOUTUBE_FAISS_PATH, "YouTube Videos")
         
+        if BUILD_UNIFIED_INDEX:
+            build_unified_index()
+        
         # Save processed hashes
         save_processed_hashes(HASH_LOG_PATH, processed_hashes)
         
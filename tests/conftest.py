@@ -0,0 +1,29 @@
+from typing import Optional
+
+import pytest
+
+from backend.llm_client import HedgingPolicy, LLMClientManager
+from benchmarks.fake_llm_server import FakeLLMServer
+
+MODEL = "mistralai/Mistral-7B-Instruct-v0.2"
+PROMPT = "What is the role of MeitY in promoting startups?"
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """A running FakeLLMServer answering after 50ms; tests change its latency and errors as needed."""
+    monkeypatch.setenv("TOGETHER_API_KEY", "local-stand-in")
+    server = FakeLLMServer(latency=lambda: 0.05).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def make_manager(server):
+    """Builds LLMClientManagers pointed at `server`, unthrottled and with short backoffs."""
+    def make(policy: Optional[HedgingPolicy] = None, **kwargs) -> LLMClientManager:
+        options = dict(model=MODEL, temperature=0.3, max_tokens=100, requests_per_second=0,
+                       backoff_base=0.01, base_url=server.url, hedging=policy)
+        options.update(kwargs)
+        return LLMClientManager(**options)
+    return make
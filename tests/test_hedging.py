@@ -0,0 +1,134 @@
+import time
+import threading
+from typing import List
+
+import pytest
+
+from backend.llm_client import HedgingPolicy
+from benchmarks.fake_llm_server import FakeLLMServer
+from conftest import PROMPT
+
+
+class ScriptedLatency:
+    """Server latency of each request in arrival order (then `default`); records arrival times."""
+
+    def __init__(self, *latencies: float, default: float = 0.1):
+        self.latencies = latencies
+        self.default = default
+        self.arrivals: List[float] = []
+        self._lock = threading.Lock()
+
+    def __call__(self) -> float:
+        with self._lock:
+            i = len(self.arrivals)
+            self.arrivals.append(time.monotonic())
+        return self.latencies[i] if i < len(self.latencies) else self.default
+
+
+def warmed_policy(first_chunk_seconds: float, samples: int = 20, **kwargs) -> HedgingPolicy:
+    """A policy whose recent first-chunk latencies are all `first_chunk_seconds`."""
+    policy = HedgingPolicy(min_samples=samples, window=samples, **kwargs)
+    for _ in range(samples):
+        policy.record(first_chunk_seconds, hedged=False, hedge_won=False)
+    return policy
+
+
+def wait_until_idle(server: FakeLLMServer, timeout: float) -> None:
+    """Waits until the server has no request in flight, failing after `timeout` seconds."""
+    start = time.monotonic()
+    while server.in_flight:
+        assert time.monotonic() - start < timeout, "server still has requests in flight"
+        time.sleep(0.01)
+
+
+def test_no_hedge_before_enough_samples(server, make_manager):
+    server.latency = ScriptedLatency(1.0)
+    policy = HedgingPolicy(min_samples=20)
+    manager = make_manager(policy)
+
+    assert "".join(manager.stream_hedged(PROMPT)) == server.answer
+    assert server.stats()["requests"] == 1
+    assert policy.stats()["hedged"] == 0
+
+
+def test_hedge_fires_only_after_the_percentile_delay(server, make_manager):
+    policy = warmed_policy(0.3, max_hedge_rate=1.0)
+    manager = make_manager(policy)
+    assert policy.delay() == pytest.approx(0.3)
+
+    # First chunk after 0.1s: answered before the delay, no hedge
+    server.latency = ScriptedLatency(0.2)
+    assert "".join(manager.stream_hedged(PROMPT)) == server.answer
+    assert server.stats()["requests"] == 1
+
+    # First chunk after 1s: the hedge goes out once the delay has passed and wins
+    server.reset_counters()
+    server.latency = latency = ScriptedLatency(2.0, 0.1)
+    assert "".join(manager.stream_hedged(PROMPT)) == server.answer
+    assert server.stats()["requests"] == 2
+    # Arrivals are timed at the server, a little after the client starts its clock
+    assert 0.25 <= latency.arrivals[1] - latency.arrivals[0] < 0.8
+    assert policy.stats()["hedge_wins"] == 1
+
+
+def test_hedge_rate_cap_holds_when_many_requests_are_slow_at_once(server, make_manager):
+    server.latency = ScriptedLatency(*[1.0] * 10)
+    policy = warmed_policy(0.05, max_hedge_rate=0.1)  # At most 2 hedges in a window of 20
+    manager = make_manager(policy, max_in_flight=32)
+
+    threads = [threading.Thread(target=lambda: "".join(manager.stream_hedged(PROMPT))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = policy.stats()
+    assert stats["hedged"] == 2
+    assert stats["hedges_denied"] >= 1
+    assert server.stats()["requests"] == 12
+
+
+def test_losing_stream_is_closed(server, make_manager):
+    server.latency = ScriptedLatency(4.0, 0.1)  # The slow first request would stream until ~4s
+    policy = warmed_policy(0.05, max_hedge_rate=1.0)
+    manager = make_manager(policy)
+
+    start = time.monotonic()
+    assert "".join(manager.stream_hedged(PROMPT)) == server.answer
+    wait_until_idle(server, timeout=3.5)
+    assert time.monotonic() - start < 3.5
+    assert server.stats()["requests"] == 2
+    # Once its first chunk arrives the loser is closed, releasing its client slot
+    assert manager.stats()["in_flight"] == 0
+
+
+def test_error_on_one_request_falls_over_to_the_other(server, make_manager):
+    server.error_rate = 1.0
+
+    def latency() -> float:
+        server.error_rate = 0.0  # Only the first request fails, after 1.0 / 4 seconds
+        server.latency = lambda: 0.6
+        return 1.0
+
+    server.latency = latency
+    policy = warmed_policy(0.05, max_hedge_rate=1.0)
+    manager = make_manager(policy, max_retries=0)
+    manager.llm  # Create the client up front so the first request reaches the server first
+
+    assert "".join(manager.stream_hedged(PROMPT)) == server.answer
+    stats = server.stats()
+    assert stats["requests"] == 2
+    assert stats["errors"] == 1
+    assert policy.stats()["hedged"] == 1
+
+
+def test_error_without_a_hedge_is_raised(server, make_manager):
+    server.error_rate = 1.0
+    server.error_status = 400
+    policy = warmed_policy(5.0, max_hedge_rate=1.0)
+    manager = make_manager(policy, max_retries=0)
+
+    with pytest.raises(Exception) as error:
+        "".join(manager.stream_hedged(PROMPT))
+    assert getattr(error.value, "status_code", None) == 400
+    assert server.stats()["requests"] == 1
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.llm_client import RetryBudget
+from conftest import PROMPT
+
+
+def test_in_flight_cap_is_shared_by_threads_and_event_loops(server, make_manager):
+    server.latency = lambda: 0.2
+    manager = make_manager(max_in_flight=3)
+
+    async def async_calls():
+        await asyncio.gather(*(manager.ainvoke(PROMPT) for _ in range(4)))
+
+    threads = [threading.Thread(target=manager.invoke, args=(PROMPT,)) for _ in range(4)]
+    threads += [threading.Thread(target="".join, args=(manager.stream(PROMPT),)) for _ in range(2)]
+    threads += [threading.Thread(target=asyncio.run, args=(async_calls(),)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = server.stats()
+    assert stats["requests"] == 14
+    assert stats["peak_in_flight"] == 3
+    assert manager.stats()["in_flight"] == 0
+
+
+def test_retries_stop_when_the_retry_budget_runs_out(server, make_manager):
+    server.error_rate = 1.0
+    manager = make_manager(max_retries=5)
+    manager.retry_budget = RetryBudget(ratio=0.0, min_per_second=0.0, max_balance=2)
+
+    with pytest.raises(Exception):
+        manager.invoke(PROMPT)
+    with pytest.raises(Exception):
+        manager.invoke(PROMPT)
+
+    stats = manager.stats()
+    assert server.stats()["requests"] == 4  # 2 calls + the 2 retries the budget held
+    assert stats["retries"] == 2
+    assert stats["retries_denied"] == 2
+    assert stats["failures"] == 2
+
+
+@pytest.mark.parametrize("status, attempts", [(503, 3), (429, 3), (400, 1), (401, 1), (404, 1)])
+def test_only_transient_statuses_are_retried(server, make_manager, status, attempts):
+    server.error_rate = 1.0
+    server.error_status = status
+    manager = make_manager(max_retries=2)
+
+    with pytest.raises(Exception) as error:
+        manager.invoke(PROMPT)
+
+    assert getattr(error.value, "status_code", None) == status
+    assert server.stats()["requests"] == attempts
+    assert manager.stats()["retries"] == attempts - 1
+
+
+def test_async_stream_retries_transient_errors_before_the_first_chunk(server, make_manager):
+    server.error_rate = 1.0
+    manager = make_manager(max_retries=2)
+
+    async def consume():
+        return "".join([chunk async for chunk in manager.astream(PROMPT)])
+
+    with pytest.raises(Exception):
+        asyncio.run(consume())
+    assert server.stats()["requests"] == 3
+
+    server.error_rate = 0.0
+    assert asyncio.run(consume()) == server.answer
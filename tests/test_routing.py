@@ -0,0 +1,32 @@
+import pytest
+from langchain.docstore.document import Document
+
+from backend.routing import FAST_ROUTE, FULL_ROUTE, QueryRouter
+
+# One confident chunk that stands out: only the wording of the query decides the route
+DOCS = [Document(page_content="Digital India is a flagship programme of MeitY."),
+        Document(page_content="The PLI scheme covers electronics manufacturing.")]
+SCORES = [0.85, 0.6]
+
+
+@pytest.mark.parametrize("query", [
+    "Describe the Digital India programme",
+    "Explain the eligibility for the PLI scheme",
+    "explain digital india",
+    "Compare Digital India and BharatNet"
+])
+def test_open_ended_questions_route_to_the_full_model(query):
+    router = QueryRouter(enabled=True)
+    assert router.route(query, DOCS, SCORES) == FULL_ROUTE
+    assert router.features(query, DOCS, SCORES)["complex_markers"]
+
+
+def test_simple_lookup_routes_to_the_fast_model():
+    router = QueryRouter(enabled=True)
+    assert router.route("What is Digital India?", DOCS, SCORES) == FAST_ROUTE
+    assert router.stats()["routed"] == {FAST_ROUTE: 1}
+
+
+def test_disabled_router_always_uses_the_full_model():
+    router = QueryRouter(enabled=False)
+    assert router.route("What is Digital India?", DOCS, SCORES) == FULL_ROUTE